@@ -31,6 +31,8 @@ except ImportError:
     HAS_EXCEL_SAFEGUARD = False
     logging.warning("Excel safeguard not available. Large Excel file support will be limited.")
 
+from app.utils.fast_read import prefetch_file
+
 # Try to import fuzzywuzzy, but provide fallback if it fails
 try:
     from fuzzywuzzy import fuzz
@@ -39,6 +41,21 @@ except ImportError:
     HAS_FUZZY = False
     logging.warning("fuzzywuzzy with python-Levenshtein not available. Using basic string similarity instead.")
 
+# rapidfuzz scores a whole block of names in one vectorized, multi-threaded call
+try:
+    from rapidfuzz import process as rf_process, fuzz as rf_fuzz
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+# Arrow's C++ CSV writer is much faster than pandas.to_csv; use it when installed
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 logging.basicConfig(level=logging.INFO, 
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -81,6 +98,8 @@ class DataCleaner:
     Handles loading, processing, and exporting data.
     """
     
+    FUZZY_SLICE_ROWS = 1000  # Rows scored per cdist call, bounding its score matrix
+    
     def __init__(self):
         """Initialize the data cleaner."""
         self.raw_data = None
@@ -91,6 +110,10 @@ class DataCleaner:
         self.file_path = None
         self.file_extension = None
         self.temp_file_path = None
+        self._full_data = None
+        self._full_data_lock = threading.Lock()  # Guards _full_data against a background load of a replaced file
+        self._search_groups: Dict[tuple, dict] = {}  # Group index per key columns, reset on load
+        self._normalized: Dict[str, tuple] = {}  # Normalized names and their hashes per column, reset on load
         
     def clear(self):
         """Reset all data attributes to their initial state."""
@@ -102,6 +125,10 @@ class DataCleaner:
         self.processing_stats = {}
         self.file_path = None
         self.file_extension = None
+        with self._full_data_lock:
+            self._full_data = None
+        self._search_groups = {}
+        self._normalized = {}
         
         # Clean up temp file if it exists
         if self.temp_file_path and os.path.exists(self.temp_file_path):
@@ -122,8 +149,14 @@ class DataCleaner:
         """
         logger.info(f"Preparing data iterator from temporary file: {temp_csv_path}")
         try:
-            self.temp_file_path = temp_csv_path
+            with self._full_data_lock:
+                self.temp_file_path = temp_csv_path
+                self._full_data = None
             self.columns = columns
+            self._search_groups = {}
+            self._normalized = {}
+            # Start kernel read-ahead so the chunked reads below hit a warm cache
+            prefetch_file(temp_csv_path)
             # This creates an iterator; it does not load the file into memory.
             self.raw_data = pd.read_csv(temp_csv_path, chunksize=10000, low_memory=False)
             logger.info("Data iterator is ready for processing.")
@@ -182,6 +215,191 @@ class DataCleaner:
             logger.error(f"Error identifying duplicates: {str(e)}")
             return None
     
+    def _load_full_data(self) -> Tuple[Optional[str], pd.DataFrame]:
+        """
+        Return (temp CSV path, full DataFrame), reading the staged CSV once per load.
+        
+        The read happens outside the lock, so another file may be loaded meanwhile;
+        the result is only cached if its file is still the current one.
+        """
+        with self._full_data_lock:
+            temp_csv_path = self.temp_file_path
+            if self._full_data is not None:
+                return temp_csv_path, self._full_data
+            raw_data = self.raw_data
+        
+        if temp_csv_path:
+            data = pd.read_csv(temp_csv_path, low_memory=False)
+        elif isinstance(raw_data, pd.DataFrame):
+            data = raw_data
+        else:
+            raise ValueError("No data loaded. Please load data first.")
+        
+        with self._full_data_lock:
+            if self.temp_file_path == temp_csv_path:
+                if self._full_data is None:
+                    self._full_data = data
+                data = self._full_data
+        return temp_csv_path, data
+
+    def _get_full_data(self) -> pd.DataFrame:
+        """Load the staged CSV into a DataFrame once and reuse it for repeated runs."""
+        return self._load_full_data()[1]
+
+    def finalize_load(self, progress_callback=None):
+        """
+        Materialize the full staged data set; meant to run in the background after the preview is shown.
+        
+        Returns:
+            Dictionary with the temp CSV path it loaded, the full DataFrame and its record count
+        """
+        if progress_callback:
+            progress_callback(-1, "Loading full data set...")
+        temp_csv_path, data = self._load_full_data()
+        with self._full_data_lock:
+            if self.temp_file_path == temp_csv_path:
+                self.total_records = len(data)
+        return {'temp_csv_path': temp_csv_path, 'data': data, 'total_records': len(data)}
+
+    def _get_search_groups(self, key: tuple) -> dict:
+        """
+        Return {group key: row positions} for the given key columns, cached until the next load.
+        
+        Args:
+            key: Tuple of column names to group on
+        """
+        groups = self._search_groups.get(key)
+        if groups is None:
+            df = self._get_full_data()
+            if key:
+                groups = df.groupby(list(key), dropna=False, sort=False).indices
+            else:
+                groups = {(): np.arange(len(df))}
+            self._search_groups[key] = groups
+        return groups
+
+    def _get_normalized_names(self, column: str) -> tuple:
+        """
+        Return (names, key_hashes) for a name column, computed once per load.
+        
+        names is an object array of lower-cased, stripped names used for fuzzy
+        scoring; key_hashes holds a 64-bit hash of each of those names, used to
+        spot exact matches.
+        """
+        normalized = self._normalized.get(column)
+        if normalized is None:
+            names = self._get_full_data()[column].astype(str).str.lower().str.strip().to_numpy(dtype=object)
+            normalized = (names, pd.util.hash_array(names))
+            self._normalized[column] = normalized
+        return normalized
+
+    @classmethod
+    def _fuzzy_duplicates_in_block(cls, names, positions, threshold):
+        """
+        Return positions in a block whose name matches an earlier kept name.
+        
+        Args:
+            names: Object array of normalized names for the whole frame
+            positions: Row positions belonging to one block
+            threshold: Minimum similarity score (0-100)
+        """
+        duplicates = []
+        
+        if HAS_RAPIDFUZZ:
+            block_names = names[positions]
+            processed = np.zeros(len(positions), dtype=bool)
+            # Score a slice of rows against the rest of the block at a time
+            for start in range(0, len(positions), cls.FUZZY_SLICE_ROWS):
+                stop = min(start + cls.FUZZY_SLICE_ROWS, len(positions))
+                scores = rf_process.cdist(block_names[start:stop], block_names[start:],
+                                          scorer=rf_fuzz.ratio, score_cutoff=threshold,
+                                          dtype=np.float32, workers=-1)
+                for i in range(start, stop):
+                    if processed[i]:
+                        continue
+                    matches = np.flatnonzero(scores[i - start, i - start + 1:] >= threshold) + i + 1
+                    matches = matches[~processed[matches]]
+                    duplicates.extend(positions[matches])
+                    processed[matches] = True
+            return duplicates
+        
+        processed = set()
+        
+        similarity = fuzz.ratio if HAS_FUZZY else basic_string_similarity
+        for i, pos in enumerate(positions):
+            if pos in processed:
+                continue
+            for other in positions[i + 1:]:
+                if other not in processed and similarity(names[pos], names[other]) >= threshold:
+                    duplicates.append(other)
+                    processed.add(other)
+            processed.add(pos)
+        return duplicates
+
+    def find_duplicates(self, options, progress_callback=None):
+        """
+        Find duplicate records using the columns and matching settings in options.
+        
+        Re-runs on the same file reuse the cached group index, so only the
+        fuzzy name comparison within each group is repeated.
+        
+        Args:
+            options: CleaningOptions with the selected columns and fuzzy settings
+            progress_callback: Optional callable(percent, message)
+            
+        Returns:
+            Dictionary with clean_count, duplicate_count and total_records
+        """
+        df = self._get_full_data()
+        name_col = options.name_column
+        block_key = tuple(col for col in (options.dob_column, options.year_column) if col)
+        
+        if progress_callback:
+            progress_callback(-1, "Finding duplicates...")
+        
+        duplicate_positions = []
+        if options.fuzzy_matching:
+            names, key_hashes = self._get_normalized_names(name_col)
+            
+            # Tier 1: rows repeating an earlier (name hash, DOB, year) key are exact duplicates
+            exact_mask = df[list(block_key)].assign(_name_key=key_hashes).duplicated(keep='first').to_numpy()
+            duplicate_positions.extend(np.flatnonzero(exact_mask))
+            
+            # Tier 2: fuzzy-compare only the remaining distinct names within each DOB/year block
+            for positions in self._get_search_groups(block_key).values():
+                positions = positions[~exact_mask[positions]]
+                if len(positions) < 2:
+                    continue
+                duplicate_positions.extend(
+                    self._fuzzy_duplicates_in_block(names, positions, options.fuzzy_threshold)
+                )
+        else:
+            for positions in self._get_search_groups((name_col,) + block_key).values():
+                duplicate_positions.extend(positions[1:])
+        
+        duplicate_mask = np.zeros(len(df), dtype=bool)
+        duplicate_mask[duplicate_positions] = True
+        self.clean_data = df[~duplicate_mask]
+        self.duplicate_data = df[duplicate_mask]
+        
+        stats = {
+            'total_records': len(df),
+            'clean_records': len(self.clean_data),
+            'duplicate_records': len(self.duplicate_data),
+            'duplicate_percentage': round(len(self.duplicate_data) / len(df) * 100, 2) if len(df) > 0 else 0
+        }
+        logger.info(f"Duplicate detection complete. Found {stats['duplicate_records']} duplicates.")
+        self.processing_stats.update(stats)
+        
+        if progress_callback:
+            progress_callback(100, "Duplicate detection complete.")
+        
+        return {
+            'clean_count': stats['clean_records'],
+            'duplicate_count': stats['duplicate_records'],
+            'total_records': stats['total_records']
+        }
+    
     def _process_dataframe(self, df, name_col, dob_col, year_col, fuzzy_match, fuzzy_threshold):
         """Process a single dataframe to identify duplicates."""
         
@@ -305,6 +523,37 @@ class DataCleaner:
         
         return stats
         
+    @staticmethod
+    def _write_csv(df, path):
+        """Write a DataFrame to CSV without the index, using Arrow's writer when available."""
+        if HAS_PYARROW:
+            try:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                pa_csv.write_csv(table, path, write_options=pa_csv.WriteOptions(include_header=True))
+                return
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+                # Mixed-type object columns can't be converted; pandas handles them
+                logger.debug(f"Arrow CSV export failed, falling back to pandas: {e}")
+        df.to_csv(path, index=False)
+
+    def get_clean_count(self):
+        """Returns the number of clean records from the last duplicate search."""
+        return len(self.clean_data) if self.clean_data is not None else 0
+
+    def export_clean_data(self, path):
+        """Export the clean records to a CSV file."""
+        if self.clean_data is None:
+            raise ValueError("No processed data to export. Please process data first.")
+        self._write_csv(self.clean_data, path)
+        logger.info(f"Exported clean data to CSV file: {path}")
+
+    def export_duplicate_data(self, path):
+        """Export the duplicate records to a CSV file."""
+        if self.duplicate_data is None:
+            raise ValueError("No processed data to export. Please process data first.")
+        self._write_csv(self.duplicate_data, path)
+        logger.info(f"Exported duplicate data to CSV file: {path}")
+
     def export_data(self, clean_path, duplicate_path):
         """
         Export clean and duplicate data to separate files in CSV or Excel format.
@@ -337,7 +586,7 @@ class DataCleaner:
                 self.clean_data.to_excel(clean_path, index=False, engine=engine)
                 logger.info(f"Exported clean data to Excel file: {clean_path}")
             else:  # Default to CSV
-                self.clean_data.to_csv(clean_path, index=False)
+                self._write_csv(self.clean_data, clean_path)
                 logger.info(f"Exported clean data to CSV file: {clean_path}")
             
             # Export duplicate data
@@ -346,7 +595,7 @@ class DataCleaner:
                 self.duplicate_data.to_excel(duplicate_path, index=False, engine=engine)
                 logger.info(f"Exported duplicate data to Excel file: {duplicate_path}")
             else:  # Default to CSV
-                self.duplicate_data.to_csv(duplicate_path, index=False)
+                self._write_csv(self.duplicate_data, duplicate_path)
                 logger.info(f"Exported duplicate data to CSV file: {duplicate_path}")
             
             # Create result with statistics
@@ -17,7 +17,7 @@ from PyQt6.QtGui import QIcon
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.views.main_window import MainWindow
-from app.utils.config import Config
+from app.utils.config import get_config
 from app.utils.data_generator import generate_education_data
 
 # Configure logging with file output
@@ -185,7 +185,7 @@ def main():
         return
     
     # Initialize configuration
-    config = Config()
+    config = get_config()
     
     # Create application
     app = QApplication(sys.argv)
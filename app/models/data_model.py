@@ -2,6 +2,7 @@
 Data models for Education Data Cleaning Tool.
 """
 
+import numpy as np
 import pandas as pd
 from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
 
@@ -9,17 +10,51 @@ from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
 class PandasTableModel(QAbstractTableModel):
     """
     Model to display pandas DataFrame in a QTableView
+    
+    Rows are exposed to the view in batches (canFetchMore/fetchMore) and each
+    column is formatted to strings once, on first access, rather than per cell.
     """
     
+    FETCH_BATCH = 1000  # Rows made visible per fetchMore
+    PLOT_MAX_CATEGORIES = 10  # Most distinct values a column may have to be charted by category
+    
     def __init__(self, data=None):
         super().__init__()
         self._data = data if data is not None else pd.DataFrame()
         self._original_data = self._data.copy()  # Store original data for filtering
         self._search_text = ""  # Current search text
+        self._search_columns = None  # Lower-cased string columns, built on first search
+        self._reset_view()
+        
+    def _reset_view(self):
+        """Drop cached display strings and show only the first batch of rows"""
+        self._str_cache = [None] * len(self._data.columns)
+        self._header_cache = [str(column) for column in self._data.columns]
+        self._loaded_rows = min(len(self._data), self.FETCH_BATCH)
         
     def rowCount(self, parent=QModelIndex()):
-        """Return the number of rows"""
-        return len(self._data)
+        """Return the number of rows currently loaded into the view"""
+        if parent.isValid():
+            return 0
+        return self._loaded_rows
+        
+    def canFetchMore(self, parent=QModelIndex()):
+        """Return True if more rows are available to load"""
+        if parent.isValid():
+            return False
+        return self._loaded_rows < len(self._data)
+        
+    def fetchMore(self, parent=QModelIndex()):
+        """Load the next batch of rows into the view"""
+        if parent.isValid():
+            return
+        remaining = len(self._data) - self._loaded_rows
+        count = min(remaining, self.FETCH_BATCH)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded_rows, self._loaded_rows + count - 1)
+        self._loaded_rows += count
+        self.endInsertRows()
         
     def columnCount(self, parent=QModelIndex()):
         """Return the number of columns"""
@@ -27,33 +62,77 @@ class PandasTableModel(QAbstractTableModel):
         
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
         """Return data for the specified role at the index"""
-        if not index.isValid():
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
             return None
             
-        if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
-            value = self._data.iloc[index.row(), index.column()]
-            return str(value)
-            
-        return None
+        column = index.column()
+        strings = self._str_cache[column]
+        if strings is None:
+            strings = self._data.iloc[:, column].astype(str).tolist()
+            self._str_cache[column] = strings
+        return strings[index.row()]
         
     def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
         """Return header data for the specified role"""
         if role == Qt.ItemDataRole.DisplayRole:
             if orientation == Qt.Orientation.Horizontal:
-                return str(self._data.columns[section])
+                return self._header_cache[section]
             else:
                 return str(section + 1)  # Row numbers
                 
         return None
         
     def setData(self, data):
-        """Set the model data"""
+        """
+        Set the model data
+        
+        When the columns and row count are unchanged the cells are refreshed with
+        dataChanged, keeping scroll position and selection; any other change
+        resets the model.
+        """
+        data = data if data is not None else pd.DataFrame()
+        same_shape = self._data.columns.equals(data.columns) and len(data) == len(self._data)
+        
+        if same_shape and not self._search_text:
+            # Same shape: refresh the cells in place, keeping scroll position and selection
+            loaded_rows = self._loaded_rows
+            self._data = data
+            self._original_data = self._data
+            self._search_columns = None
+            self._reset_view()
+            self._loaded_rows = loaded_rows
+            if loaded_rows and len(data.columns):
+                self.dataChanged.emit(self.index(0, 0), self.index(loaded_rows - 1, len(data.columns) - 1))
+            return
+        
         self.beginResetModel()
-        self._data = data if data is not None else pd.DataFrame()
-        self._original_data = self._data.copy()  # Store original data for filtering
+        self._data = data
+        self._original_data = self._data  # Unfiltered data; never modified, so no copy is needed
         self._search_text = ""  # Reset search when data changes
+        self._search_columns = None
+        self._reset_view()
         self.endResetModel()
         
+    def setDataFrame(self, data, columns_renamed=False):
+        """
+        Set the model data, refreshing only the header when just the column labels changed
+        
+        Args:
+            data: New DataFrame
+            columns_renamed: True if data is the current data with renamed columns
+                (e.g. after field mapping); cached cells and any active search filter
+                are kept and only the horizontal header is refreshed
+        """
+        if not (columns_renamed and data is not None and data.shape == self._original_data.shape):
+            self.setData(data)
+            return
+        
+        self._data = self._data.set_axis(data.columns, axis=1)
+        self._original_data = data
+        self._header_cache = [str(column) for column in data.columns]
+        if len(data.columns):
+            self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, len(data.columns) - 1)
+        
     def update_data(self, data):
         """Update the model data - alias for setData"""
         self.setData(data)
@@ -66,29 +145,44 @@ class PandasTableModel(QAbstractTableModel):
             # If search is empty, restore original data
             self.beginResetModel()
             self._data = self._original_data.copy()
+            self._reset_view()
             self.endResetModel()
             return
         
-        # Filter data - search in all columns
-        filtered_data = self._original_data.copy()
-        mask = None
-        
-        # Create a mask that checks if any column contains the search text
-        for column in filtered_data.columns:
-            column_mask = filtered_data[column].astype(str).str.contains(
-                self._search_text, case=False, na=False
-            )
-            if mask is None:
-                mask = column_mask
-            else:
-                mask = mask | column_mask
+        # Columns are stringified and lower-cased once, then reused for every search
+        if self._search_columns is None:
+            self._search_columns = [
+                self._original_data.iloc[:, i].astype(str).str.lower()
+                for i in range(len(self._original_data.columns))
+            ]
+        if not self._search_columns:
+            return
         
-        # Apply the mask to filter the data
-        if mask is not None:
-            self.beginResetModel()
-            self._data = filtered_data[mask]
-            self.endResetModel()
+        # Row matches if any column contains the search text (literal, case-insensitive)
+        needle = self._search_text.lower()
+        mask = np.logical_or.reduce([
+            column.str.contains(needle, regex=False, na=False).to_numpy(dtype=bool)
+            for column in self._search_columns
+        ])
+        
+        self.beginResetModel()
+        self._data = self._original_data[mask]
+        self._reset_view()
+        self.endResetModel()
             
+    @classmethod
+    def plot_candidate(cls, data):
+        """
+        Return the first categorical column of data with few enough distinct values to chart
+        
+        Uses a single nunique() over the categorical columns. Only reads data, so it is
+        safe to call off the GUI thread on the frame being rendered.
+        """
+        categorical = data.select_dtypes(include=['object', 'category'])
+        uniques = categorical.nunique(dropna=True)
+        suitable = uniques.index[uniques.to_numpy() <= cls.PLOT_MAX_CATEGORIES]
+        return suitable[0] if len(suitable) else None
+        
     def get_row_count_status(self):
         """Return a status string showing filtered/total rows"""
         if len(self._data) == len(self._original_data) or len(self._original_data) == 0:
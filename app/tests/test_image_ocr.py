@@ -6,11 +6,16 @@ Unit tests for image_ocr.py module.
 import os
 import unittest
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
 import numpy as np
+import pandas as pd
 
 # Import the module to test
-from app.utils.image_ocr import ImageOCR, process_student_image, face_recognition
+from app.utils.image_ocr import (
+    ImageOCR, PhotoProcessor, process_student_image, process_student_images,
+    face_recognition, _load_rgb_image
+)
 
 
 class TestImageOcr(unittest.TestCase):
@@ -41,9 +46,10 @@ class TestImageOcr(unittest.TestCase):
     def test_process_student_image_with_face_detection(self):
         """Test processing a student image with face detection."""
         # Mock face_recognition functions
-        with patch('app.utils.image_ocr.face_recognition') as mock_face_rec:
+        with patch('app.utils.image_ocr.face_recognition') as mock_face_rec, \
+                patch('app.utils.image_ocr._load_rgb_image') as mock_load_image:
             # Setup mock returns
-            mock_face_rec.load_image_file.return_value = np.zeros((100, 100, 3), dtype=np.uint8)
+            mock_load_image.return_value = np.zeros((100, 100, 3), dtype=np.uint8)
             mock_face_rec.face_locations.return_value = [(10, 50, 60, 20)]  # (top, right, bottom, left)
             mock_face_rec.face_encodings.return_value = [np.zeros(128)]
             
@@ -55,10 +61,10 @@ class TestImageOcr(unittest.TestCase):
                 )
                 
                 # Call the function to test
-                result = process_student_image(self.test_image_path)
+                result = process_student_image(self.test_image_path, need_encoding=True)
                 
                 # Verify calls
-                mock_face_rec.load_image_file.assert_called_once_with(self.test_image_path)
+                mock_load_image.assert_called_once_with(self.test_image_path)
                 mock_face_rec.face_locations.assert_called_once()
                 mock_face_rec.face_encodings.assert_called_once()
                 mock_ocr.process_image.assert_called_once_with(self.test_image_path)
@@ -71,6 +77,24 @@ class TestImageOcr(unittest.TestCase):
                 self.assertEqual(result['face_count'], 1)
                 self.assertEqual(result['face_locations'], [(10, 50, 60, 20)])
                 self.assertTrue(result['has_face_encoding'])
+                self.assertIn('face_encoding', result)
+    
+    def test_process_student_image_skips_encoding_by_default(self):
+        """Test that face encodings are only computed when requested."""
+        with patch('app.utils.image_ocr.face_recognition') as mock_face_rec, \
+                patch('app.utils.image_ocr._load_rgb_image') as mock_load_image:
+            mock_load_image.return_value = np.zeros((100, 100, 3), dtype=np.uint8)
+            mock_face_rec.face_locations.return_value = [(10, 50, 60, 20)]
+            
+            with patch('app.utils.image_ocr.image_ocr') as mock_ocr:
+                mock_ocr.process_image.return_value = ({}, None)
+                
+                result = process_student_image(self.test_image_path)
+                
+                mock_face_rec.face_encodings.assert_not_called()
+                self.assertTrue(result['face_detected'])
+                self.assertFalse(result['has_face_encoding'])
+                self.assertNotIn('face_encoding', result)
     
     def test_process_student_image_without_face_detection(self):
         """Test processing a student image without face detection library."""
@@ -92,6 +116,21 @@ class TestImageOcr(unittest.TestCase):
                 self.assertFalse(result['face_detected'])
                 self.assertEqual(result['face_count'], 0)
     
+    def test_load_rgb_image(self):
+        """Test that images are loaded as contiguous RGB uint8 arrays."""
+        from PIL import Image
+        
+        png_path = os.path.join(self.test_dir, "test_image.png")
+        Image.new('L', (20, 10), color=255).save(png_path)
+        try:
+            image = _load_rgb_image(png_path)
+            
+            self.assertEqual(image.shape, (10, 20, 3))
+            self.assertEqual(image.dtype, np.uint8)
+            self.assertTrue((image == 255).all())
+        finally:
+            os.remove(png_path)
+    
     def test_ocr_extraction(self):
         """Test the OCR text extraction functionality."""
         # Create an instance of ImageOCR
@@ -114,5 +153,78 @@ class TestImageOcr(unittest.TestCase):
             self.assertEqual(result['date_of_birth'], '01/01/2000')
 
 
+class TestProcessStudentImages(unittest.TestCase):
+    """Tests for batch photo processing."""
+    
+    def setUp(self):
+        """Run the pool in threads so the stubbed process_student_image is used."""
+        def thread_pool(max_workers, mp_context):
+            return ThreadPoolExecutor(max_workers=max_workers)
+        
+        def fake_process(image_path, need_encoding=False):
+            if image_path == 'bad.jpg':
+                raise ValueError("unreadable image")
+            return {'image_path': image_path, 'need_encoding': need_encoding}
+        
+        patchers = [
+            patch('app.utils.image_ocr.ProcessPoolExecutor', side_effect=thread_pool),
+            patch('app.utils.image_ocr.process_student_image', side_effect=fake_process),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def test_results_keep_input_order(self):
+        """Test that results line up with the input paths and errors are captured."""
+        progress = MagicMock()
+        
+        results = process_student_images(['a.jpg', 'bad.jpg', 'c.jpg'], need_encoding=True,
+                                          progress_callback=progress)
+        
+        self.assertEqual(results[0], {'image_path': 'a.jpg', 'need_encoding': True})
+        self.assertEqual(results[1], {'image_path': 'bad.jpg', 'error': 'unreadable image'})
+        self.assertEqual(results[2], {'image_path': 'c.jpg', 'need_encoding': True})
+        self.assertEqual(progress.call_count, 3)
+        self.assertEqual(progress.call_args[0][0], 100)
+    
+    def test_empty_batch(self):
+        """Test that an empty batch does not start a pool."""
+        self.assertEqual(process_student_images([]), [])
+
+
+class TestPhotoProcessor(unittest.TestCase):
+    """Tests for PhotoProcessor duplicate detection."""
+    
+    def setUp(self):
+        """Create a processor with stubbed face encodings."""
+        with patch('app.utils.image_ocr.face_recognition', MagicMock()):
+            self.processor = PhotoProcessor(tempfile.gettempdir())
+        
+        self.encodings = {
+            'a.jpg': np.zeros(128),
+            'b.jpg': np.full(128, 0.01),  # Close to a.jpg
+            'c.jpg': np.ones(128),        # Far from everything
+            'd.jpg': np.zeros(128),       # Same as a.jpg
+        }
+        self.processor.get_face_encoding = lambda photo_file: self.encodings.get(photo_file)
+    
+    def test_find_duplicates_groups_under_first_match(self):
+        """Test that matching photos are grouped under the first occurrence."""
+        df = pd.DataFrame({'photo': list(self.encodings)}, index=[10, 11, 12, 13])
+        
+        duplicates = self.processor.find_duplicates(df, 'photo')
+        
+        self.assertEqual(duplicates, {10: [11, 13]})
+    
+    def test_find_duplicates_reuses_processed_encodings(self):
+        """Test that encodings from processed results skip re-encoding."""
+        df = pd.DataFrame({'photo': ['a.jpg', 'x.jpg']})
+        processed = {'x.jpg': {'face_encoding': np.zeros(128)}}
+        
+        duplicates = self.processor.find_duplicates(df, 'photo', processed_results=processed)
+        
+        self.assertEqual(duplicates, {0: [1]})
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -20,9 +20,10 @@ class TestFaceDetectionIntegration(unittest.TestCase):
         # Create a temp test image path
         self.test_image_path = "/path/to/test_image.jpg"
     
+    @patch('app.utils.image_ocr._load_rgb_image')
     @patch('app.utils.image_ocr.face_recognition')
     @patch('app.utils.image_ocr.image_ocr')
-    def test_process_student_image_with_face(self, mock_ocr, mock_face_recognition):
+    def test_process_student_image_with_face(self, mock_ocr, mock_face_recognition, mock_load_image):
         """Test processing a student image with a face."""
         # Configure mocks
         mock_ocr.process_image.return_value = (
@@ -31,12 +32,12 @@ class TestFaceDetectionIntegration(unittest.TestCase):
         )
         
         # Mock face_recognition functions
-        mock_face_recognition.load_image_file.return_value = np.zeros((100, 100, 3))
+        mock_load_image.return_value = np.zeros((100, 100, 3))
         mock_face_recognition.face_locations.return_value = [(10, 50, 60, 20)]  # One face found
         mock_face_recognition.face_encodings.return_value = [np.zeros(128)]  # Face encoding
         
         # Call the function
-        result = process_student_image(self.test_image_path)
+        result = process_student_image(self.test_image_path, need_encoding=True)
         
         # Verify results
         self.assertTrue(result['face_detected'])
@@ -45,9 +46,10 @@ class TestFaceDetectionIntegration(unittest.TestCase):
         self.assertTrue(result['has_face_encoding'])
         self.assertEqual(result['student_id'], 'S12345')
     
+    @patch('app.utils.image_ocr._load_rgb_image')
     @patch('app.utils.image_ocr.face_recognition')
     @patch('app.utils.image_ocr.image_ocr')
-    def test_process_student_image_no_face(self, mock_ocr, mock_face_recognition):
+    def test_process_student_image_no_face(self, mock_ocr, mock_face_recognition, mock_load_image):
         """Test processing a student image without any face."""
         # Configure mocks
         mock_ocr.process_image.return_value = (
@@ -56,12 +58,12 @@ class TestFaceDetectionIntegration(unittest.TestCase):
         )
         
         # Mock face_recognition functions
-        mock_face_recognition.load_image_file.return_value = np.zeros((100, 100, 3))
+        mock_load_image.return_value = np.zeros((100, 100, 3))
         mock_face_recognition.face_locations.return_value = []  # No faces found
         mock_face_recognition.face_encodings.return_value = []  # No encodings
         
         # Call the function
-        result = process_student_image(self.test_image_path)
+        result = process_student_image(self.test_image_path, need_encoding=True)
         
         # Verify results
         self.assertFalse(result['face_detected'])
@@ -70,9 +72,10 @@ class TestFaceDetectionIntegration(unittest.TestCase):
         self.assertFalse(result['has_face_encoding'])
         self.assertEqual(result['student_id'], 'S12345')
     
+    @patch('app.utils.image_ocr._load_rgb_image')
     @patch('app.utils.image_ocr.face_recognition')
     @patch('app.utils.image_ocr.image_ocr')
-    def test_process_student_image_multiple_faces(self, mock_ocr, mock_face_recognition):
+    def test_process_student_image_multiple_faces(self, mock_ocr, mock_face_recognition, mock_load_image):
         """Test processing a student image with multiple faces."""
         # Configure mocks
         mock_ocr.process_image.return_value = (
@@ -81,12 +84,12 @@ class TestFaceDetectionIntegration(unittest.TestCase):
         )
         
         # Mock face_recognition functions - 2 faces
-        mock_face_recognition.load_image_file.return_value = np.zeros((100, 100, 3))
+        mock_load_image.return_value = np.zeros((100, 100, 3))
         mock_face_recognition.face_locations.return_value = [(10, 50, 60, 20), (70, 90, 120, 60)]
         mock_face_recognition.face_encodings.return_value = [np.zeros(128), np.zeros(128)]
         
         # Call the function
-        result = process_student_image(self.test_image_path)
+        result = process_student_image(self.test_image_path, need_encoding=True)
         
         # Verify results
         self.assertTrue(result['face_detected'])
@@ -16,7 +16,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 from app.utils.api_connector import ApiConfig, ApiConnector, EducationDataApi
-from app.utils.config import Config
+from app.utils.config import get_config
 
 
 class ApiTester:
@@ -33,7 +33,7 @@ class ApiTester:
             timeout: API timeout in seconds
             retries: Number of retries for failed requests
         """
-        self.config = Config()
+        self.config = get_config()
         
         # Use provided values or load from config
         self.api_url = api_url or self.config.get("api_url", "")
@@ -6,10 +6,18 @@ import os
 import json
 import logging
 from pathlib import Path
+from PyQt6.QtCore import QSettings
 
 
 class Config:
-    """Configuration manager for the application"""
+    """Configuration manager for the application
+    
+    Values are stored with QSettings (an INI file in the user's config location)
+    and held in memory after the first read.
+    """
+    
+    ORGANIZATION = "PeeapDev"
+    APPLICATION = "EducationDataCleaner"
     
     DEFAULT_CONFIG = {
         "recent_files": [],
@@ -19,13 +27,24 @@ class Config:
         "auto_export": False,
         "export_directory": "",
         "chunk_size": 50000,  # for large file processing
+        "enable_api": False,
+        "api_url": "",
+        "api_key": "",
+        "api_timeout": 30,
+        "api_retries": 3,
+        "usage_tracking": True,
+        "collect_feedback": True,
     }
     
     def __init__(self):
         """Initialize the configuration manager"""
         self.config_dir = self._get_config_dir()
-        self.config_file = os.path.join(self.config_dir, "config.json")
-        self.config = self._load_config()
+        self.legacy_config_file = os.path.join(self.config_dir, "config.json")
+        self._settings = QSettings(QSettings.Format.IniFormat, QSettings.Scope.UserScope,
+                                   self.ORGANIZATION, self.APPLICATION)
+        self.config_file = self._settings.fileName()
+        self.config = self._load_config()  # Read once; get/set work on this dict
+        self._dirty = False  # Unsaved changes pending for save()
         
     def _get_config_dir(self):
         """Get the configuration directory, create if it doesn't exist"""
@@ -43,48 +62,69 @@ class Config:
         return config_dir
         
     def _load_config(self):
-        """Load configuration from file, or create default if it doesn't exist"""
-        if not os.path.exists(self.config_file):
-            return self._save_config(self.DEFAULT_CONFIG)
-            
-        try:
-            with open(self.config_file, "r") as f:
-                config = json.load(f)
-                
-            # Update with any missing default keys
-            updated = False
-            for key, value in self.DEFAULT_CONFIG.items():
-                if key not in config:
-                    config[key] = value
-                    updated = True
-                    
-            if updated:
-                self._save_config(config)
-                
-            return config
+        """Load configuration from QSettings, importing the old JSON file on first run"""
+        if not self._settings.allKeys():
+            return self._save_config(self._load_legacy_config())
             
-        except Exception as e:
-            logging.error(f"Failed to load config: {str(e)}")
-            return self._save_config(self.DEFAULT_CONFIG)
+        config = dict(self.DEFAULT_CONFIG)
+        for key in self._settings.allKeys():
+            default = self.DEFAULT_CONFIG.get(key)
+            if default is None:
+                config[key] = self._settings.value(key)
+            else:
+                # INI values come back as strings unless the expected type is given
+                config[key] = self._settings.value(key, default, type=type(default))
+        return config
+        
+    def _load_legacy_config(self):
+        """Return the defaults merged with the JSON config used by earlier versions, if any"""
+        config = dict(self.DEFAULT_CONFIG)
+        if os.path.exists(self.legacy_config_file):
+            try:
+                with open(self.legacy_config_file, "r") as f:
+                    config.update(json.load(f))
+            except Exception as e:
+                logging.error(f"Failed to load legacy config: {str(e)}")
+        return config
             
     def _save_config(self, config):
-        """Save configuration to file"""
-        try:
-            with open(self.config_file, "w") as f:
-                json.dump(config, f, indent=2)
-            return config
-        except Exception as e:
-            logging.error(f"Failed to save config: {str(e)}")
-            return self.DEFAULT_CONFIG
+        """Save configuration to QSettings"""
+        for key, value in config.items():
+            self._settings.setValue(key, value)
+        self._settings.sync()
+        
+        if self._settings.status() != QSettings.Status.NoError:
+            logging.error(f"Failed to save config: {self._settings.status().name}")
+            return dict(self.DEFAULT_CONFIG)
+        return config
             
     def get(self, key, default=None):
         """Get a configuration value"""
         return self.config.get(key, default)
         
     def set(self, key, value):
-        """Set a configuration value"""
+        """Set a configuration value in memory; call save() to write it to disk"""
         self.config[key] = value
+        self._dirty = True
+        
+    def update(self, values):
+        """Set several configuration values in memory; only real changes mark the config dirty
+        
+        Returns:
+            True if any value changed
+        """
+        changed = {key: value for key, value in values.items() if self.config.get(key) != value}
+        if changed:
+            self.config.update(changed)
+            self._dirty = True
+        return bool(changed)
+        
+    def save(self):
+        """Write the configuration to disk if it has unsaved changes"""
+        if not self._dirty:
+            return
         self._save_config(self.config)
+        self._dirty = False
         
     def add_recent_file(self, file_path):
         """Add a file to the recent files list"""
@@ -103,4 +143,16 @@ class Config:
             recent_files = recent_files[:max_files]
             
         self.set("recent_files", recent_files)
+        self.save()
         return recent_files
+
+
+# Process-wide instance, created on first use
+_instance = None
+
+def get_config():
+    """Return the shared Config instance, so the config file is read once per process"""
+    global _instance
+    if _instance is None:
+        _instance = Config()
+    return _instance
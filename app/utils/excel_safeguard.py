@@ -3,6 +3,7 @@ Excel safeguard utility for handling problematic and large Excel files.
 This module provides a single, robust method for loading Excel files.
 """
 
+import csv
 import logging
 import os
 import pandas as pd
@@ -10,11 +11,16 @@ import tempfile
 import traceback
 from typing import Callable, Optional, Dict
 
+from app.utils.fast_read import prefetch_file
+
 logger = logging.getLogger(__name__)
 
 class ExcelSafeguard:
     """Provides a safe, non-blocking method for loading Excel files."""
     
+    PREVIEW_ROWS = 1000  # Rows decoded into the preview DataFrame
+    BATCH_ROWS = 8192  # Rows buffered per CSV write
+    
     def __init__(self):
         self.temp_files = []
         
@@ -66,7 +72,7 @@ class ExcelSafeguard:
                            file_path: str, 
                            progress_callback: Optional[Callable]) -> Dict:
         """
-        The definitive non-blocking method to load any Excel file (.xls or .xlsx) by chunking.
+        The definitive non-blocking method to load any Excel file (.xls or .xlsx) into a temporary CSV.
         Always uses an indeterminate progress bar to ensure UI responsiveness.
         """
         try:
@@ -94,68 +100,24 @@ class ExcelSafeguard:
             temp_csv.close()
             self.temp_files.append(temp_csv_path)
             
-            # Manually chunk the Excel file using skiprows and nrows since chunksize is not supported.
-            logger.info(f"Starting manual chunked conversion to CSV: {temp_csv_path} using engine: {engine}")
+            logger.info(f"Starting streamed conversion to CSV: {temp_csv_path} using engine: {engine}")
+            prefetch_file(file_path)
             
-            preview_df = None
-            processed_rows = 0
-            chunk_size = 1000
-            is_first_chunk = True
-
-            # First, load the complete dataset for preview (no row limit)
-            try:
-                # Attempt to load the entire file for preview
-                logger.info("Loading complete dataset for preview")
-                preview_df = pd.read_excel(file_path, engine=engine)
-                logger.info(f"Successfully loaded full preview with {len(preview_df)} rows")
-                
-                # Estimate total rows for progress feedback
-                total_rows = len(preview_df)
-                
-                # Still need to process in chunks for CSV conversion
-                import openpyxl
-                if file_extension == '.xlsx' and total_rows == 0:
-                    wb = openpyxl.load_workbook(file_path, read_only=True)
-                    sheet = wb.active
-                    total_rows = sheet.max_row
-                    wb.close()
-                    logger.info(f"Estimated total rows: {total_rows}")
-                else:
-                    total_rows = None  # We can't easily estimate for .xls without blocking.
-            except Exception as e:
-                logger.warning(f"Could not estimate total rows: {e}")
-                total_rows = None
-
-            with open(temp_csv_path, 'w', newline='', encoding='utf-8') as f:
-                skip = 0
-                while True:
-                    # Read a small batch of rows.
-                    chunk = pd.read_excel(file_path, engine=engine, skiprows=skip, nrows=chunk_size)
-                    if len(chunk) == 0:
-                        break
-                        
-                    if is_first_chunk:
-                        # Don't override preview_df as we already loaded the full dataset
-                        # Just write the chunk to CSV
-                        chunk.to_csv(f, index=False, header=True)
-                        is_first_chunk = False
-                    else:
-                        chunk.to_csv(f, index=False, header=False)
-
-                    processed_rows += len(chunk)
-                    skip += len(chunk)
-
-                    if progress_callback:
-                        if total_rows:
-                            progress_pct = min(99, int((processed_rows / total_rows) * 99))
-                            progress_callback(-1, f"Processing... {processed_rows:,}/{total_rows:,} rows ({progress_pct}%)")
-                        else:
-                            progress_callback(-1, f"Processing... {processed_rows:,} rows loaded")
+            if engine == 'openpyxl':
+                preview_df, processed_rows = self._stream_xlsx_to_csv(file_path, temp_csv_path, progress_callback)
+            else:
+                # xlrd always reads the whole workbook, so convert it in a single pass
+                df = pd.read_excel(file_path, engine=engine)
+                df.to_csv(temp_csv_path, index=False)
+                preview_df = df.head(self.PREVIEW_ROWS)
+                processed_rows = len(df)
+                del df
 
             logger.info(f"Chunked conversion successful, total rows: {processed_rows}")
             if progress_callback:
                 progress_callback(100, "Load complete.")
-            return {'success': True, 'preview_df': preview_df, 'temp_csv_path': temp_csv_path}
+            return {'success': True, 'preview_df': preview_df, 'temp_csv_path': temp_csv_path,
+                    'total_rows': processed_rows}
         
         except Exception as e:
             error_msg = f"The unified chunked loader failed: {e}"
@@ -165,5 +127,84 @@ class ExcelSafeguard:
                 progress_callback(0, "Error during loading.")
             return {'success': False, 'error': error_msg}
 
+    def _stream_xlsx_to_csv(self,
+                            file_path: str,
+                            temp_csv_path: str,
+                            progress_callback: Optional[Callable]):
+        """
+        Stream an .xlsx sheet row by row into a CSV file without building a full DataFrame.
+        
+        Only the first PREVIEW_ROWS rows are decoded into the returned preview DataFrame.
+        
+        Returns:
+            Tuple of (preview_df, number of data rows written)
+        """
+        import openpyxl
+        
+        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            # First sheet, as pandas.read_excel reads; wb.active is whichever tab was last selected
+            sheet = wb.worksheets[0]
+            total_rows = sheet.max_row - 1 if sheet.max_row else None
+            rows = sheet.iter_rows(values_only=True)
+            
+            header = next(rows, None)
+            if header is None:
+                open(temp_csv_path, 'w').close()
+                return pd.DataFrame(), 0
+            columns = self._make_column_names(header)
+            width = len(columns)
+            
+            preview_rows = []
+            batch = []
+            processed_rows = 0
+            with open(temp_csv_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for row in rows:
+                    # Blank rows are skipped, matching pandas.read_excel
+                    if all(value is None for value in row):
+                        continue
+                    # Read-only sheets with a missing or stale dimension record yield ragged rows
+                    if len(row) != width:
+                        row = row[:width] + (None,) * (width - len(row))
+                    if len(preview_rows) < self.PREVIEW_ROWS:
+                        preview_rows.append(row)
+                    batch.append(row)
+                    
+                    if len(batch) >= self.BATCH_ROWS:
+                        writer.writerows(batch)
+                        processed_rows += len(batch)
+                        batch = []
+                        if progress_callback:
+                            if total_rows:
+                                progress_pct = min(99, int((processed_rows / total_rows) * 99))
+                                progress_callback(-1, f"Processing... {processed_rows:,}/{total_rows:,} rows ({progress_pct}%)")
+                            else:
+                                progress_callback(-1, f"Processing... {processed_rows:,} rows loaded")
+                
+                writer.writerows(batch)
+                processed_rows += len(batch)
+        finally:
+            wb.close()
+        
+        preview_df = pd.DataFrame(preview_rows, columns=columns)
+        return preview_df, processed_rows
+    
+    @staticmethod
+    def _make_column_names(header) -> list:
+        """Build unique column names from a header row the way pandas.read_excel does."""
+        columns = []
+        seen = {}
+        for i, name in enumerate(header):
+            name = f"Unnamed: {i}" if name is None else str(name)
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            columns.append(name)
+        return columns
+
 # Singleton instance for easy import and use
 excel_safeguard = ExcelSafeguard()
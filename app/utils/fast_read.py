@@ -0,0 +1,46 @@
+"""
+Read-ahead helpers for the large temporary files the app stages on disk.
+"""
+
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Files smaller than this are cheap to read cold; don't bother hinting the kernel
+PREFETCH_MIN_SIZE = 16 * 1024 * 1024
+
+
+def prefetch_file(path: str) -> bool:
+    """
+    Ask the kernel to start reading a file into the page cache in the background.
+
+    Uses posix_fadvise (POSIX_FADV_SEQUENTIAL + POSIX_FADV_WILLNEED) so the
+    following sequential read finds its data already cached. Does nothing on
+    platforms without posix_fadvise or for files below PREFETCH_MIN_SIZE.
+
+    Args:
+        path: File that is about to be read sequentially
+
+    Returns:
+        True if the read-ahead hint was issued
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return False
+
+    try:
+        size = os.path.getsize(path)
+        if size < PREFETCH_MIN_SIZE:
+            return False
+
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, size, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+        return True
+
+    except OSError as e:
+        logger.debug(f"Read-ahead hint failed for {path}: {e}")
+        return False
@@ -9,7 +9,7 @@ import logging
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Tuple, Set
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
 # Configure logging
 logging.basicConfig(level=logging.INFO,
@@ -22,8 +22,13 @@ class QuantizeAI:
     fields from any Excel or CSV file to standard fields based on content patterns.
     """
     
+    MAPPING_CACHE_SIZE = 8  # Number of recent frame signatures to remember
+    
     def __init__(self):
         """Initialize the field mapper with known field patterns."""
+        # Recent map_fields results keyed by frame signature (LRU)
+        self._mapping_cache = OrderedDict()
+        
         self.field_patterns = {
             'name': [
                 r'^(?:student|pupil|learner)?[\s_]*(?:full[\s_]*)?name$', 
@@ -97,6 +102,15 @@ class QuantizeAI:
         Returns:
             Dictionary mapping original column names to standard field names
         """
+        # Reuse the result for a frame with the same columns, dtypes and contents; the
+        # caller passes a small sample frame, so hashing its cells is cheap
+        content_hash = int(pd.util.hash_pandas_object(df, index=False).sum())
+        key = (tuple(df.columns), tuple(str(t) for t in df.dtypes), len(df), content_hash)
+        if key in self._mapping_cache:
+            self._mapping_cache.move_to_end(key)
+            logger.info("Using cached field mapping")
+            return dict(self._mapping_cache[key])
+        
         field_mapping = {}
         columns = df.columns.tolist()
         
@@ -119,6 +133,10 @@ class QuantizeAI:
         for original, mapped in field_mapping.items():
             logger.info(f"  {original} → {mapped}")
         
+        self._mapping_cache[key] = dict(field_mapping)
+        if len(self._mapping_cache) > self.MAPPING_CACHE_SIZE:
+            self._mapping_cache.popitem(last=False)
+        
         return field_mapping
     
     def _match_column_name(self, column_name: str) -> str:
@@ -283,3 +301,6 @@ class QuantizeAI:
                 new_df[col] = df[col]
         
         return new_df
+
+# Singleton instance so mapping results are cached across dialogs
+quantize_ai = QuantizeAI()
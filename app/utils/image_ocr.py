@@ -3,10 +3,14 @@ Image OCR utility for processing student photos and extracting text data.
 Uses OpenCV and Tesseract for OCR capabilities.
 """
 
+import io
 import os
 import cv2
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
+from PIL import Image
 from typing import Dict, Optional, Tuple, List, Any
 import tempfile
 
@@ -17,8 +21,50 @@ try:
 except ImportError:
     HAS_TESSERACT = False
 
+# Optional libjpeg-turbo decoder, noticeably faster than PIL for JPEG photos
+try:
+    import simplejpeg
+    HAS_SIMPLEJPEG = True
+except ImportError:
+    HAS_SIMPLEJPEG = False
+
 logger = logging.getLogger(__name__)
 
+# Common install locations for the tesseract binary
+TESSERACT_COMMON_PATHS = (
+    '/usr/bin/tesseract',
+    '/usr/local/bin/tesseract',
+    'C:\\Program Files\\Tesseract-OCR\\tesseract.exe',
+)
+
+# Process-wide caches so probing and warm-up only happen once
+_tesseract_path_probe = None
+_tesseract_version = None
+_tesseract_warmed_up = False
+
+
+def _find_tesseract_path() -> Optional[str]:
+    """Return the first existing common tesseract path, probing the filesystem only once."""
+    global _tesseract_path_probe
+    if _tesseract_path_probe is None:
+        _tesseract_path_probe = next(
+            (path for path in TESSERACT_COMMON_PATHS if os.path.exists(path)), ''
+        )
+    return _tesseract_path_probe or None
+
+
+def get_tesseract_version():
+    """Return the installed tesseract version (cached), or None if it cannot be run."""
+    global _tesseract_version
+    if _tesseract_version is None and HAS_TESSERACT:
+        try:
+            _tesseract_version = pytesseract.get_tesseract_version()
+        except Exception as e:
+            logger.warning(f"Could not determine tesseract version: {str(e)}")
+            _tesseract_version = False  # Don't retry on every call
+    return _tesseract_version or None
+
+
 class ImageOCR:
     """Provides OCR capabilities for student photo processing."""
     
@@ -32,17 +78,7 @@ class ImageOCR:
         
         # Try to auto-detect tesseract path
         if HAS_TESSERACT:
-            # Common paths for tesseract
-            common_paths = [
-                '/usr/bin/tesseract',
-                '/usr/local/bin/tesseract',
-                'C:\\Program Files\\Tesseract-OCR\\tesseract.exe',
-            ]
-            
-            for path in common_paths:
-                if os.path.exists(path):
-                    self.config['tesseract_path'] = path
-                    break
+            self.config['tesseract_path'] = _find_tesseract_path()
     
     def _check_ocr_available(self) -> bool:
         """Check if OCR capabilities are available."""
@@ -59,6 +95,27 @@ class ImageOCR:
             logger.warning(f"OpenCV not working properly. OCR disabled: {str(e)}")
             return False
     
+    def warmup(self) -> None:
+        """
+        Run a trivial OCR pass so tesseract startup and language data loading
+        are paid once up front rather than on the first real image.
+        
+        Not run on construction, since the module-level instance is built on
+        import (including in every photo worker process); call it from idle time.
+        """
+        global _tesseract_warmed_up
+        if _tesseract_warmed_up or not self.config['ocr_enabled']:
+            return
+            
+        if get_tesseract_version() is None:
+            return
+            
+        try:
+            pytesseract.image_to_string(np.zeros((10, 10), dtype=np.uint8), lang=self.config['language'])
+            _tesseract_warmed_up = True
+        except Exception as e:
+            logger.warning(f"Tesseract warm-up failed: {str(e)}")
+    
     def configure(self, config: Dict[str, Any]) -> None:
         """
         Configure OCR settings.
@@ -68,6 +125,7 @@ class ImageOCR:
                 - tesseract_path: Path to tesseract executable
                 - language: OCR language (default: eng)
         """
+        global _tesseract_version, _tesseract_warmed_up
         if 'tesseract_path' in config and config['tesseract_path']:
             self.config['tesseract_path'] = config['tesseract_path']
             
@@ -78,19 +136,25 @@ class ImageOCR:
         if HAS_TESSERACT and self.config['tesseract_path']:
             try:
                 pytesseract.pytesseract.tesseract_cmd = self.config['tesseract_path']
+                # Probe the new binary instead of reusing a result (or failure) from the old one
+                _tesseract_version = None
+                _tesseract_warmed_up = False
                 logger.info(f"Tesseract configured with path: {self.config['tesseract_path']}")
             except Exception as e:
                 logger.error(f"Failed to configure tesseract: {str(e)}")
     
     def process_image(self, 
                      image_path: str, 
-                     preprocess: bool = True) -> Tuple[Optional[Dict[str, str]], Optional[np.ndarray]]:
+                     preprocess: bool = True,
+                     image_bytes: Optional[bytes] = None) -> Tuple[Optional[Dict[str, str]], Optional[np.ndarray]]:
         """
         Process an image and extract text using OCR.
         
         Args:
             image_path: Path to the image file
             preprocess: Whether to preprocess the image for better OCR results
+            image_bytes: Contents of the image file if the caller already read it;
+                decoded in memory instead of reading image_path again
             
         Returns:
             Tuple of (extracted_text_dict, processed_image)
@@ -99,13 +163,16 @@ class ImageOCR:
             logger.warning("OCR is not enabled or available")
             return None, None
             
-        if not os.path.exists(image_path):
+        if image_bytes is None and not os.path.exists(image_path):
             logger.error(f"Image file not found: {image_path}")
             return None, None
             
         try:
             # Read image
-            image = cv2.imread(image_path)
+            if image_bytes is not None:
+                image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+            else:
+                image = cv2.imread(image_path)
             processed_image = image.copy()
             
             # Preprocessing for better OCR
@@ -234,11 +301,45 @@ except ImportError:
     logger.warning("face_recognition library not found. Facial similarity features will be disabled.")
 
 
-def process_student_image(image_path):
+def _load_rgb_image(image_path, image_bytes=None):
+    """Load an image file as a contiguous RGB uint8 array suitable for face_recognition.
+    
+    JPEG files are decoded straight into an ndarray with simplejpeg when it is
+    installed; everything else goes through PIL, which reads the file lazily
+    instead of buffering it first.
+    
+    Args:
+        image_path: Path to the image file
+        image_bytes: Contents of the image file if the caller already read it
+        
+    Returns:
+        numpy array of shape (height, width, 3)
+    """
+    if HAS_SIMPLEJPEG and os.path.splitext(image_path)[1].lower() in ('.jpg', '.jpeg'):
+        try:
+            if image_bytes is not None:
+                return simplejpeg.decode_jpeg(image_bytes, colorspace='RGB')
+            with open(image_path, 'rb') as f:
+                return simplejpeg.decode_jpeg(f.read(), colorspace='RGB')
+        except ValueError:
+            # Not a baseline JPEG simplejpeg can handle, fall back to PIL
+            pass
+            
+    source = io.BytesIO(image_bytes) if image_bytes is not None else image_path
+    with Image.open(source) as img:
+        return np.asarray(img.convert('RGB'))
+
+
+def process_student_image(image_path, need_encoding=False, image_bytes=None):
     """Process a student ID or document photo to extract information and detect faces.
     
     Args:
         image_path: Path to the image file
+        need_encoding: Whether to compute face encodings for the detected faces.
+            Encoding re-runs the landmark predictor, so it is skipped unless the
+            caller needs it (e.g. for duplicate detection).
+        image_bytes: Contents of the image file if the caller already read it, so
+            OCR and face detection decode it from memory instead of re-reading
         
     Returns:
         Dictionary with extracted information and face detection results
@@ -246,7 +347,7 @@ def process_student_image(image_path):
     logger.info(f"Processing student photo: {image_path}")
     
     # Process with OCR
-    extracted_info, processed_image = image_ocr.process_image(image_path)
+    extracted_info, processed_image = image_ocr.process_image(image_path, image_bytes=image_bytes)
     
     # Initialize result dict
     result = {
@@ -267,19 +368,23 @@ def process_student_image(image_path):
     try:
         if face_recognition:
             # Load image for face detection
-            image = face_recognition.load_image_file(image_path)
+            image = _load_rgb_image(image_path, image_bytes)
             
             # Detect face locations (returns list of tuples with (top, right, bottom, left))
             face_locations = face_recognition.face_locations(image)
             
-            # Get face encodings if faces are found
-            face_encodings = face_recognition.face_encodings(image, face_locations) if face_locations else []
+            # Get face encodings only when requested, reusing the detected locations
+            face_encodings = []
+            if need_encoding and face_locations:
+                face_encodings = face_recognition.face_encodings(image, face_locations)
             
             # Add face detection results
             result['face_detected'] = len(face_locations) > 0
             result['face_count'] = len(face_locations)
             result['face_locations'] = face_locations
             result['has_face_encoding'] = len(face_encodings) > 0
+            if face_encodings:
+                result['face_encoding'] = face_encodings[0]
             
             logger.info(f"Face detection results: {len(face_locations)} faces found")
         else:
@@ -290,9 +395,52 @@ def process_student_image(image_path):
     
     return result
 
+
+def process_student_images(image_paths, need_encoding=False, progress_callback=None):
+    """Process several student photos in parallel worker processes.
+    
+    OCR preprocessing and face detection are CPU-bound and only partly release
+    the GIL, so the photos are spread over a process pool rather than threads.
+    
+    Args:
+        image_paths: Paths of the image files to process
+        need_encoding: Passed through to process_student_image
+        progress_callback: Optional callback taking (percent, message)
+        
+    Returns:
+        List of process_student_image results, in the same order as image_paths
+    """
+    image_paths = list(image_paths)
+    total = len(image_paths)
+    if not total:
+        return []
+    
+    results = [None] * total
+    # Don't start more workers than there are photos; spawn keeps Qt state out of the children
+    max_workers = min(os.cpu_count() or 1, total)
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = {
+            executor.submit(process_student_image, path, need_encoding): i
+            for i, path in enumerate(image_paths)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                logger.error(f"Error processing {image_paths[i]}: {e}")
+                results[i] = {'image_path': image_paths[i], 'error': str(e)}
+            if progress_callback:
+                progress_callback(int(done / total * 100), f"Processed photo {done}/{total}")
+    
+    return results
+
 class PhotoProcessor:
     """Handles loading, processing, and comparing student photos for facial similarity."""
 
+    MATCH_TOLERANCE = 0.6  # Maximum face distance for two photos to count as the same person
+
     def __init__(self, image_folder_path):
         if not face_recognition:
             raise ImportError("face_recognition library is required for PhotoProcessor.")
@@ -306,7 +454,7 @@ class PhotoProcessor:
         try:
             image_path = os.path.join(self.image_folder_path, file_name)
             if os.path.exists(image_path):
-                return face_recognition.load_image_file(image_path)
+                return _load_rgb_image(image_path)
             else:
                 logger.warning(f"Image file not found: {file_name}")
                 return None
@@ -326,8 +474,17 @@ class PhotoProcessor:
                 logger.error(f"Could not get face encoding for {image_file}: {e}")
         return None
 
-    def find_duplicates(self, dataframe, photo_column, progress_callback=None):
-        """Finds duplicate students based on facial similarity."""
+    def find_duplicates(self, dataframe, photo_column, progress_callback=None, processed_results=None):
+        """Finds duplicate students based on facial similarity.
+        
+        Args:
+            dataframe: DataFrame with one row per student
+            photo_column: Column holding the photo file names
+            progress_callback: Optional callback taking (percent, message)
+            processed_results: Optional dict mapping photo file names to results
+                from process_student_image(..., need_encoding=True). Encodings found
+                there are reused instead of reloading and re-encoding the image.
+        """
         if photo_column not in dataframe.columns:
             logger.error(f"Photo column '{photo_column}' not found in dataframe.")
             return {}
@@ -339,7 +496,11 @@ class PhotoProcessor:
             if photo_file and isinstance(photo_file, str):
                 if progress_callback:
                     progress_callback(int((i / total_rows) * 100), f"Encoding photo {i+1}/{total_rows}")
-                encoding = self.get_face_encoding(photo_file)
+                cached = processed_results.get(photo_file) if processed_results else None
+                if cached is not None and cached.get('face_encoding') is not None:
+                    encoding = cached['face_encoding']
+                else:
+                    encoding = self.get_face_encoding(photo_file)
                 if encoding is not None:
                     face_encodings[index] = encoding
 
@@ -347,38 +508,29 @@ class PhotoProcessor:
             logger.warning("No face encodings could be generated. Check image paths and file integrity.")
             return {}
 
-        duplicates = {}
-        # Compare all found encodings
-        items = list(face_encodings.items())
-        total_comparisons = len(items)
-        for i in range(total_comparisons):
-            index1, encoding1 = items[i]
-            if progress_callback:
-                progress_callback(int((i / total_comparisons) * 100), f"Comparing photo {i+1}/{total_comparisons}")
-
-            if index1 in duplicates: continue # Already marked as a duplicate
+        indices = list(face_encodings.keys())
+        encodings = np.asarray(list(face_encodings.values()), dtype=np.float64)
+        total = len(indices)
+        if progress_callback:
+            progress_callback(0, f"Comparing {total} photos...")
 
-            # Create a list of encodings to compare against
-            compare_indices = [items[j][0] for j in range(i + 1, total_comparisons)]
-            compare_encodings = [items[j][1] for j in range(i + 1, total_comparisons)]
+        # Pairwise euclidean distances in one pass (same metric as face_recognition.compare_faces)
+        sq_norms = np.einsum('ij,ij->i', encodings, encodings)
+        sq_dist = sq_norms[:, None] + sq_norms[None, :] - 2.0 * (encodings @ encodings.T)
+        matches = np.sqrt(np.maximum(sq_dist, 0.0)) <= self.MATCH_TOLERANCE
 
-            if not compare_encodings: continue
-
-            # Compare face and get a list of True/False values
-            results = face_recognition.compare_faces(compare_encodings, encoding1, tolerance=0.6)
-
-            # Find the indices of all matches
-            matched_indices = [compare_indices[k] for k, matched in enumerate(results) if matched]
+        duplicates = {}
+        visited = np.zeros(total, dtype=bool)
+        for i in range(total):
+            if visited[i]:
+                continue  # Already grouped under an earlier photo
 
-            if matched_indices:
-                if index1 not in duplicates:
-                    duplicates[index1] = []
-                for match_index in matched_indices:
-                    if match_index not in duplicates:
-                        duplicates[index1].append(match_index)
-                        # Mark the other as a duplicate to avoid re-adding
-                        duplicates[match_index] = []
+            # Unvisited later photos that match this one
+            matched = np.flatnonzero(matches[i, i + 1:] & ~visited[i + 1:]) + i + 1
+            if matched.size:
+                visited[matched] = True
+                duplicates[indices[i]] = [indices[j] for j in matched]
 
-        # Clean up the duplicates list to return only parent duplicates
-        final_duplicates = {k: v for k, v in duplicates.items() if v}
-        return final_duplicates
\ No newline at end of file
+        if progress_callback:
+            progress_callback(100, f"Compared {total} photos")
+        return duplicates
\ No newline at end of file
@@ -4,7 +4,6 @@ Memory monitoring utility to prevent app crashes on large files.
 
 import os
 import sys
-import time
 import logging
 import threading
 import traceback
@@ -15,12 +14,18 @@ logger = logging.getLogger(__name__)
 class MemoryMonitor:
     """Monitors memory usage during data processing to prevent crashes."""
     
+    SAMPLE_INTERVAL = 1.0  # seconds between samples normally
+    SPIKE_SAMPLE_INTERVAL = 0.2  # seconds between samples after a spike
+    SPIKE_FAST_SAMPLES = 10  # number of fast samples taken after a spike
+    
     def __init__(self):
         self.monitoring = False
         self.monitor_thread = None
         self.last_memory_usage = 0
         self.peak_memory_usage = 0
         self.crash_protection_enabled = True
+        self._stop_event = threading.Event()
+        self._fast_samples_remaining = 0
     
     def start_monitoring(self):
         """Start monitoring memory usage in a background thread."""
@@ -28,6 +33,7 @@ class MemoryMonitor:
             return
             
         self.monitoring = True
+        self._stop_event.clear()
         self.monitor_thread = threading.Thread(target=self._monitor_thread_func)
         self.monitor_thread.daemon = True
         self.monitor_thread.start()
@@ -36,6 +42,7 @@ class MemoryMonitor:
     def stop_monitoring(self):
         """Stop the memory monitoring thread."""
         self.monitoring = False
+        self._stop_event.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=1.0)
         logger.info(f"Memory monitoring stopped. Peak usage: {self.peak_memory_usage} MB")
@@ -80,6 +87,8 @@ class MemoryMonitor:
                 # Check for dangerous memory spikes
                 memory_change = current_usage - self.last_memory_usage
                 if memory_change > 500 and self.crash_protection_enabled:  # 500MB spike
+                    # Sample faster for a while to catch further growth
+                    self._fast_samples_remaining = self.SPIKE_FAST_SAMPLES
                     logger.critical(f"DANGEROUS MEMORY SPIKE: {memory_change:.2f} MB increase!")
                     logger.critical("Writing emergency memory dump and enabling protective measures")
                     self._write_emergency_dump(f"Memory spike of {memory_change:.2f} MB detected")
@@ -91,7 +100,16 @@ class MemoryMonitor:
                     self._write_emergency_dump(f"Critical memory usage: {current_usage:.2f} MB")
                     
                 self.last_memory_usage = current_usage
-                time.sleep(1.0)  # Check every second
+                
+                if self._fast_samples_remaining > 0:
+                    self._fast_samples_remaining -= 1
+                    interval = self.SPIKE_SAMPLE_INTERVAL
+                else:
+                    interval = self.SAMPLE_INTERVAL
+                
+                # Wait returns True as soon as stop_monitoring() is called
+                if self._stop_event.wait(interval):
+                    break
                 
         except Exception as e:
             tb = traceback.format_exc()
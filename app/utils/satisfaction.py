@@ -2,37 +2,100 @@
 User satisfaction tracking and analysis for the Education Data Cleaning Tool.
 """
 
+import io
 import os
+import gzip
 import json
+import atexit
 import datetime
 import logging
-import pandas as pd
-import matplotlib.pyplot as plt
 from typing import Dict, Any, List, Optional
 
-from app.utils.config import Config
-from app.utils.reporting import CleaningReport
+from PyQt6.QtCore import QCoreApplication, QTimer
+
+from app.utils.config import get_config
+
+# Use orjson when available for faster load/save of large satisfaction files
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize an object to compact JSON bytes"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
 
 
 class SatisfactionTracker:
     """Tracks and analyzes user satisfaction with the data cleaning tool"""
     
+    FLUSH_DELAY_MS = 5000  # Write at most once per this interval
+    MAX_ENTRIES = 10_000  # Ratings/comments kept in the live file; older ones are archived
+    
     def __init__(self):
         """Initialize the satisfaction tracker"""
-        self.config = Config()
+        self.config = get_config()
         self.data_file = os.path.join(self.config._get_config_dir(), "satisfaction_data.json")
+        self.archive_file = os.path.join(self.config._get_config_dir(), "satisfaction_data.archive.jsonl.gz")
+        
+        # Users who opted out of both feedback and usage tracking don't touch the data
+        # file until they turn one of them back on
+        self._loaded = False
+        if self._collection_enabled():
+            self._ensure_loaded()
+        else:
+            self.satisfaction_data = self._empty_data()
+            self._update_metrics()
+        
+        # Writes are batched: record_* marks the data dirty and a timer flushes it
+        self._dirty = False
+        self._flush_pending = False
+        atexit.register(self._flush_if_dirty)
+        
+        # Created on first chart generation and reused afterwards
+        self._chart_figure = None
+        
+    def _collection_enabled(self) -> bool:
+        """Return True if feedback or usage tracking is on, read live so Settings changes apply at once"""
+        return self.config.get("collect_feedback", True) or self.config.get("usage_tracking", True)
+    
+    def _ensure_loaded(self):
+        """Load the data file on first use, including when tracking is turned on mid-session"""
+        if self._loaded:
+            return
         self.satisfaction_data = self._load_data()
+        self._loaded = True
         
+        # Data files written before metrics were kept incrementally need a one-off rebuild
+        if "sum" not in self.satisfaction_data.get("metrics", {}):
+            self._update_metrics()
+    
     def _load_data(self) -> Dict[str, Any]:
         """Load satisfaction data from file"""
         if os.path.exists(self.data_file):
             try:
-                with open(self.data_file, "r") as f:
-                    return json.load(f)
+                with open(self.data_file, "rb") as f:
+                    return _loads(f.read())
             except Exception as e:
                 logging.error(f"Failed to load satisfaction data: {str(e)}")
                 
         # Return empty data structure if file doesn't exist or loading fails
+        return self._empty_data()
+    
+    @staticmethod
+    def _empty_data() -> Dict[str, Any]:
+        """Return an empty satisfaction data structure"""
         return {
             "ratings": [],
             "comments": [],
@@ -42,13 +105,64 @@ class SatisfactionTracker:
     
     def _save_data(self):
         """Save satisfaction data to file"""
+        if not self._loaded or not self._collection_enabled():
+            return
+            
         try:
-            with open(self.data_file, "w") as f:
-                json.dump(self.satisfaction_data, f, indent=2)
+            # Write compactly to a temp file, then swap it in so a crash can't truncate the data
+            tmp_file = self.data_file + ".tmp"
+            with open(tmp_file, "wb") as f:
+                f.write(_dumps(self.satisfaction_data))
+            os.replace(tmp_file, self.data_file)
                 
         except Exception as e:
             logging.error(f"Failed to save satisfaction data: {str(e)}")
     
+    def _archive_overflow(self, key: str):
+        """
+        Move the oldest entries of a list beyond MAX_ENTRIES to the compressed archive
+        
+        Metrics are kept incrementally, so trimming the live list doesn't affect them.
+        
+        Args:
+            key: Name of the list in satisfaction_data ("ratings" or "comments")
+        """
+        entries = self.satisfaction_data[key]
+        if len(entries) <= self.MAX_ENTRIES:
+            return
+            
+        overflow = entries[:-self.MAX_ENTRIES]
+        try:
+            with gzip.open(self.archive_file, "ab") as f:
+                for entry in overflow:
+                    f.write(_dumps({"type": key, "entry": entry}) + b"\n")
+        except Exception as e:
+            logging.error(f"Failed to archive satisfaction data: {str(e)}")
+            return
+            
+        del entries[:-self.MAX_ENTRIES]
+    
+    def _schedule_save(self):
+        """Mark data as changed and schedule a single deferred save"""
+        self._dirty = True
+        if self._flush_pending:
+            return
+            
+        # Without a Qt event loop the timer would never fire, so save right away
+        if QCoreApplication.instance() is None:
+            self._flush_if_dirty()
+            return
+            
+        self._flush_pending = True
+        QTimer.singleShot(self.FLUSH_DELAY_MS, self._flush_if_dirty)
+    
+    def _flush_if_dirty(self):
+        """Save data to file if anything changed since the last save"""
+        self._flush_pending = False
+        if self._dirty:
+            self._dirty = False
+            self._save_data()
+    
     def record_satisfaction(self, rating: int, comments: Optional[str] = None, 
                            cleaning_result: Optional[Dict[str, Any]] = None):
         """
@@ -62,10 +176,13 @@ class SatisfactionTracker:
         # Check if user has opted out of data collection
         if not self.config.get("collect_feedback", True):
             return
+        self._ensure_loaded()
             
-        # Create rating entry
+        # Create rating entry; the date is stored so reports and charts needn't re-parse timestamps
+        now = datetime.datetime.now()
         entry = {
-            "timestamp": datetime.datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
+            "date": now.date().isoformat(),
             "rating": rating,
             "comments": comments if comments else ""
         }
@@ -80,22 +197,33 @@ class SatisfactionTracker:
         
         # Add to data
         self.satisfaction_data["ratings"].append(entry)
+        self._archive_overflow("ratings")
         
         if comments:
             self.satisfaction_data["comments"].append({
                 "timestamp": entry["timestamp"],
+                "date": entry["date"],
                 "comment": comments,
                 "rating": rating
             })
+            self._archive_overflow("comments")
             
-        # Update metrics
-        self._update_metrics()
+        # Update metrics incrementally
+        metrics = self.satisfaction_data["metrics"]
+        metrics["count"] += 1
+        metrics["sum"] += rating
+        distribution = metrics["distribution"]
+        distribution[str(rating)] = distribution.get(str(rating), 0) + 1
+        metrics["last_updated"] = entry["timestamp"]
         
-        # Save data
-        self._save_data()
+        # Save data (batched)
+        self._schedule_save()
         
         # Add to current report if available
         if cleaning_result and "report" in cleaning_result:
+            # Imported here: reporting pulls in pandas and matplotlib
+            from app.utils.reporting import CleaningReport
+            
             report = cleaning_result["report"]
             if isinstance(report, CleaningReport):
                 report.add_user_satisfaction_data(rating, comments)
@@ -110,6 +238,7 @@ class SatisfactionTracker:
         # Check if user has opted out of data collection
         if not self.config.get("usage_tracking", True):
             return
+        self._ensure_loaded()
             
         # Initialize feature if not present
         if feature not in self.satisfaction_data["features"]:
@@ -118,28 +247,34 @@ class SatisfactionTracker:
         # Increment usage count
         self.satisfaction_data["features"][feature] += 1
         
-        # Save data
-        self._save_data()
+        # Save data (batched)
+        self._schedule_save()
     
     def _update_metrics(self):
-        """Update satisfaction metrics based on collected data"""
-        ratings = [entry["rating"] for entry in self.satisfaction_data["ratings"]]
+        """Rebuild satisfaction metrics from all collected ratings.
         
-        if not ratings:
-            return
+        Only needed to migrate data files from before metrics were updated
+        incrementally in record_satisfaction.
+        """
+        distribution = {str(i): 0 for i in range(1, 6)}
+        total = 0
+        for entry in self.satisfaction_data["ratings"]:
+            key = str(entry["rating"])
+            distribution[key] = distribution.get(key, 0) + 1
+            total += entry["rating"]
             
-        # Calculate metrics
         self.satisfaction_data["metrics"] = {
-            "count": len(ratings),
-            "average_rating": sum(ratings) / len(ratings),
-            "distribution": {str(i): ratings.count(i) for i in range(1, 6)},
+            "count": len(self.satisfaction_data["ratings"]),
+            "sum": total,
+            "distribution": distribution,
             "last_updated": datetime.datetime.now().isoformat()
         }
     
     def get_average_rating(self) -> float:
         """Get the average satisfaction rating"""
         metrics = self.satisfaction_data.get("metrics", {})
-        return metrics.get("average_rating", 0.0)
+        count = metrics.get("count", 0)
+        return metrics.get("sum", 0) / count if count else 0.0
     
     def get_rating_count(self) -> int:
         """Get the total number of ratings"""
@@ -156,69 +291,88 @@ class SatisfactionTracker:
         Returns:
             Path to the saved report file
         """
-        # Create report
-        report = []
-        report.append("=" * 60)
-        report.append("USER SATISFACTION REPORT")
-        report.append("=" * 60)
-        report.append(f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append("")
+        rule = "-" * 60
+        buf = io.StringIO()
+        
+        # Header
+        buf.write(f"{'=' * 60}\nUSER SATISFACTION REPORT\n{'=' * 60}\n")
+        buf.write(f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
         
         # Summary section
         metrics = self.satisfaction_data.get("metrics", {})
-        report.append("SUMMARY")
-        report.append("-" * 60)
-        report.append(f"Total ratings: {metrics.get('count', 0)}")
-        report.append(f"Average rating: {metrics.get('average_rating', 0.0):.1f} / 5.0")
-        report.append("")
+        total = metrics.get("count", 0)
+        buf.write(f"SUMMARY\n{rule}\n")
+        buf.write(f"Total ratings: {total}\n")
+        buf.write(f"Average rating: {self.get_average_rating():.1f} / 5.0\n\n")
         
         # Distribution
-        report.append("RATING DISTRIBUTION")
-        report.append("-" * 60)
+        buf.write(f"RATING DISTRIBUTION\n{rule}\n")
         distribution = metrics.get("distribution", {})
         for i in range(5, 0, -1):
             count = distribution.get(str(i), 0)
-            percentage = (count / metrics.get("count", 1)) * 100 if metrics.get("count", 0) > 0 else 0
+            percentage = (count / total) * 100 if total > 0 else 0
             stars = "★" * i + "☆" * (5 - i)
-            report.append(f"{stars} ({i}): {count} ({percentage:.1f}%)")
-        report.append("")
+            buf.write(f"{stars} ({i}): {count} ({percentage:.1f}%)\n")
+        buf.write("\n")
         
         # Feature usage
-        report.append("FEATURE USAGE")
-        report.append("-" * 60)
+        buf.write(f"FEATURE USAGE\n{rule}\n")
         features = self.satisfaction_data.get("features", {})
         for feature, count in sorted(features.items(), key=lambda x: x[1], reverse=True):
-            report.append(f"{feature}: {count}")
-        report.append("")
+            buf.write(f"{feature}: {count}\n")
+        buf.write("\n")
         
-        # Recent comments
-        report.append("RECENT COMMENTS")
-        report.append("-" * 60)
+        # Recent comments (5 most recent)
+        buf.write(f"RECENT COMMENTS\n{rule}\n")
         comments = self.satisfaction_data.get("comments", [])
-        for i, comment in enumerate(reversed(comments)):
-            if i >= 5:  # Only show 5 most recent comments
-                break
-                
-            timestamp = datetime.datetime.fromisoformat(comment["timestamp"]).strftime("%Y-%m-%d")
+        for comment in reversed(comments[-5:]):
+            # Older entries were stored without a preformatted date
+            date = comment.get("date") or comment["timestamp"][:10]
             stars = "★" * comment["rating"] + "☆" * (5 - comment["rating"])
-            report.append(f"[{timestamp}] {stars}")
-            report.append(f"\"{comment['comment']}\"")
-            report.append("")
+            buf.write(f"[{date}] {stars}\n\"{comment['comment']}\"\n\n")
         
-        # Compile report
-        report_text = "\n".join(report)
+        report_text = buf.getvalue()
         
         # Save to file if specified
         if output_file:
             try:
                 os.makedirs(os.path.dirname(output_file), exist_ok=True)
-                with open(output_file, "w") as f:
-                    f.write(report_text)
+                tmp_file = output_file + ".tmp"
+                with open(tmp_file, "wb", buffering=1 << 20) as f:
+                    f.write(report_text.encode("utf-8"))
+                os.replace(tmp_file, output_file)
             except Exception as e:
                 logging.error(f"Failed to save satisfaction report: {str(e)}")
                 
         return report_text
     
+    def _get_chart_axes(self, figsize):
+        """
+        Return a cleared Axes on the tracker's reusable chart figure
+        
+        The figure is created once with an Agg canvas and reused for every chart,
+        avoiding repeated pyplot figure construction and teardown.
+        
+        Args:
+            figsize: (width, height) in inches for the next chart
+        """
+        if self._chart_figure is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            
+            self._chart_figure = Figure()
+            FigureCanvasAgg(self._chart_figure)
+            params = self._chart_figure.subplotpars
+            self._default_subplot_params = {
+                name: getattr(params, name)
+                for name in ("left", "bottom", "right", "top", "wspace", "hspace")
+            }
+            
+        self._chart_figure.clear()
+        self._chart_figure.subplots_adjust(**self._default_subplot_params)  # Undo any tight_layout
+        self._chart_figure.set_size_inches(*figsize)
+        return self._chart_figure.add_subplot()
+    
     def generate_satisfaction_charts(self, output_dir: Optional[str] = None) -> List[str]:
         """
         Generate charts visualizing satisfaction data
@@ -239,64 +393,58 @@ class SatisfactionTracker:
         if not ratings:
             return []
             
+        # Heavy imports are deferred until charts are actually requested
+        import pandas as pd
+        
         df = pd.DataFrame(ratings)
         
-        # Convert timestamp to datetime
+        # Use the stored ISO date; older entries only have the timestamp to slice it from
         if "timestamp" in df.columns:
-            df["timestamp"] = pd.to_datetime(df["timestamp"])
-            df["date"] = df["timestamp"].dt.date
+            if "date" in df.columns:
+                df["date"] = df["date"].fillna(df["timestamp"].str[:10])
+            else:
+                df["date"] = df["timestamp"].str[:10]
             
         chart_files = []
         
         try:
             # Rating distribution pie chart
-            plt.figure(figsize=(8, 6))
+            ax = self._get_chart_axes((8, 6))
             ratings_count = df["rating"].value_counts().sort_index()
-            plt.pie(ratings_count, labels=[f"{i} Stars" for i in ratings_count.index], 
-                    autopct="%1.1f%%", startangle=90)
-            plt.title("User Satisfaction Rating Distribution")
+            ax.pie(ratings_count, labels=[f"{i} Stars" for i in ratings_count.index], 
+                   autopct="%1.1f%%", startangle=90)
+            ax.set_title("User Satisfaction Rating Distribution")
             pie_file = os.path.join(output_dir, "rating_distribution.png")
-            plt.savefig(pie_file)
-            plt.close()
+            self._chart_figure.savefig(pie_file)
             chart_files.append(pie_file)
             
             # Rating over time line chart
             if len(df) > 1 and "date" in df.columns:
-                plt.figure(figsize=(10, 6))
-                df_grouped = df.groupby("date")["rating"].mean()
-                plt.plot(df_grouped.index, df_grouped.values, marker="o")
-                plt.title("Average Rating Over Time")
-                plt.xlabel("Date")
-                plt.ylabel("Average Rating")
-                plt.grid(True, linestyle="--", alpha=0.7)
-                plt.ylim(0.5, 5.5)
-                plt.yticks(range(1, 6))
+                ax = self._get_chart_axes((10, 6))
+                # ISO date strings sort chronologically; only the per-day index is parsed
+                df_grouped = df.groupby("date", sort=True)["rating"].mean()
+                ax.plot(pd.to_datetime(df_grouped.index), df_grouped.values, marker="o")
+                ax.set_title("Average Rating Over Time")
+                ax.set_xlabel("Date")
+                ax.set_ylabel("Average Rating")
+                ax.grid(True, linestyle="--", alpha=0.7)
+                ax.set_ylim(0.5, 5.5)
+                ax.set_yticks(range(1, 6))
                 line_file = os.path.join(output_dir, "rating_trend.png")
-                plt.savefig(line_file)
-                plt.close()
+                self._chart_figure.savefig(line_file)
                 chart_files.append(line_file)
                 
             # Feature usage bar chart
             features = self.satisfaction_data.get("features", {})
             if features:
-                plt.figure(figsize=(10, 6))
-                feature_names = list(features.keys())
-                feature_counts = list(features.values())
-                
-                # Sort by count
-                sorted_indices = sorted(range(len(feature_counts)), 
-                                        key=lambda i: feature_counts[i], 
-                                        reverse=True)
-                sorted_names = [feature_names[i] for i in sorted_indices]
-                sorted_counts = [feature_counts[i] for i in sorted_indices]
-                
-                plt.barh(sorted_names, sorted_counts)
-                plt.title("Feature Usage")
-                plt.xlabel("Usage Count")
-                plt.tight_layout()
+                ax = self._get_chart_axes((10, 6))
+                feature_counts = pd.Series(features).sort_values(ascending=False)
+                ax.barh(feature_counts.index, feature_counts.values)
+                ax.set_title("Feature Usage")
+                ax.set_xlabel("Usage Count")
+                self._chart_figure.tight_layout()
                 feature_file = os.path.join(output_dir, "feature_usage.png")
-                plt.savefig(feature_file)
-                plt.close()
+                self._chart_figure.savefig(feature_file)
                 chart_files.append(feature_file)
                 
         except Exception as e:
@@ -1,81 +1,98 @@
 """
-Worker thread implementation for background processing in the Education Data Cleaning Tool.
+Worker implementation for background processing in the Education Data Cleaning Tool.
 """
 
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from concurrent.futures import CancelledError
 import traceback
 import logging
-import time
 
 
-class WorkerThread(QThread):
-    """Worker thread to handle background processing tasks"""
+class WorkerSignals(QObject):
+    """Signals available from a running worker"""
     
-    # Signals
     progress = pyqtSignal(int)
     status = pyqtSignal(str)
     error = pyqtSignal(str)
     finished_with_result = pyqtSignal(dict)
+
+
+class WorkerRunnable(QRunnable):
+    """Runnable to handle background processing tasks on the global thread pool"""
     
     def __init__(self, task_func, *args, **kwargs):
         """
-        Initialize the worker thread
+        Initialize the worker
         
         Args:
-            task_func: Function to execute in the background
+            task_func: Function to execute in the background. It receives a
+                progress_callback whose return value is False once the task
+                has been cancelled; long tasks should then raise CancelledError.
             *args, **kwargs: Arguments to pass to task_func
         """
         super().__init__()
         self.task_func = task_func
         self.args = args
         self.kwargs = kwargs
+        self.signals = WorkerSignals()
         self.running = False
+        self.cancelled = False
         self.result = None
         
+    def start(self):
+        """Queue the task on the global thread pool"""
+        self.running = True
+        QThreadPool.globalInstance().start(self)
+        
     def run(self):
-        """Execute the task function in a separate thread"""
+        """Execute the task function on a pooled thread"""
         self.running = True
         self.result = None
         try:
             # Report initial status
-            self.status.emit("Starting background task...")
-            self.progress.emit(0)
+            self.signals.status.emit("Starting background task...")
+            self.signals.progress.emit(0)
             
             # Execute the task
             if "progress_callback" not in self.kwargs:
                 self.kwargs["progress_callback"] = self.report_progress
                 
             self.result = self.task_func(*self.args, **self.kwargs)
+            if self.cancelled:
+                return
             
             # Report completion
-            self.progress.emit(100)
-            self.status.emit("Task completed.")
+            self.signals.progress.emit(100)
+            self.signals.status.emit("Task completed.")
             
             # Return the result
-            self.finished_with_result.emit(self.result)
+            self.signals.finished_with_result.emit(self.result)
+            
+        except CancelledError:
+            logging.info("Worker task cancelled")
             
         except Exception as e:
-            logging.error(f"Error in worker thread: {str(e)}")
+            logging.error(f"Error in worker: {str(e)}")
             logging.error(traceback.format_exc())
-            self.error.emit(str(e))
+            self.signals.error.emit(str(e))
             
         finally:
             self.running = False
             
     def report_progress(self, value, status_text=None):
-        """Report progress from the task function"""
-        self.progress.emit(value)
+        """Report progress from the task function; returns False once cancelled"""
+        self.signals.progress.emit(value)
         if status_text:
-            self.status.emit(status_text)
+            self.signals.status.emit(status_text)
+        return self.running
             
     def is_running(self):
-        """Check if the thread is running"""
+        """Check if the task is running"""
         return self.running
         
     def cancel(self):
         """Request cancellation of the task"""
         if self.running:
             self.running = False
-            self.status.emit("Task cancelled by user.")
-            self.quit()
-            self.wait()
+            self.cancelled = True
+            self.signals.status.emit("Task cancelled by user.")
@@ -6,15 +6,17 @@ Allows users to review and adjust AI-suggested field mappings
 import os
 import sys
 import logging
+import pandas as pd
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QTableWidget, QTableWidgetItem, QComboBox, QHeaderView,
     QMessageBox, QProgressBar, QFrame, QSplitter, QApplication
 )
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 
-from app.utils.field_mapper import QuantizeAI
+from app.utils.field_mapper import quantize_ai
+from app.utils.worker import WorkerRunnable
 
 logger = logging.getLogger(__name__)
 
@@ -23,28 +25,39 @@ class FieldMapperDialog(QDialog):
     
     mapping_confirmed = pyqtSignal(dict)  # Signal emitted with confirmed mapping
     
-    def __init__(self, dataframe, parent=None):
+    def __init__(self, dataframe, parent=None, preview=None):
         """
         Initialize the field mapper dialog
         
         Args:
             dataframe: Pandas DataFrame to analyze and map
             parent: Parent widget
+            preview: DataFrame of whole records shown in the preview; defaults to dataframe
         """
         super().__init__(parent)
         self.setWindowTitle("Quantize AI - Field Mapping")
         self.setMinimumSize(800, 600)
         
         self.dataframe = dataframe
-        self.quantize_ai = QuantizeAI()
+        self.quantize_ai = quantize_ai
         self.field_mapping = {}  # Will hold {original_col: standard_field}
         self.standard_fields = list(self.quantize_ai.standard_fields.values())
         
+        # Dropdown entries and their positions, shared by every row's combo box
+        self._field_items = ["-- Skip Field --"] + self.standard_fields
+        self._field_index = {name: i for i, name in enumerate(self._field_items)}
+        
+        # Preview cells never change with the mapping; stringify them once
+        self._preview_head = (self.dataframe if preview is None else preview).head(5)
+        self._preview_strings = self._preview_head.astype(str).values
+        self._preview_filled = False
+        
         # Set up UI
         self.init_ui()
         
-        # Run the AI mapping after a short delay (allows UI to show first)
-        QTimer.singleShot(100, self.run_ai_mapping)
+        # Run the AI mapping in the background so the dialog stays responsive
+        self._worker = None
+        self.run_ai_mapping()
     
     def init_ui(self):
         """Set up the dialog UI components"""
@@ -103,10 +116,20 @@ class FieldMapperDialog(QDialog):
         self.setLayout(layout)
     
     def run_ai_mapping(self):
-        """Run the AI mapping and populate the UI with results"""
+        """Start the AI mapping on a background worker"""
+        self._worker = WorkerRunnable(self._map_fields_task)
+        self._worker.signals.finished_with_result.connect(self._on_mapping_done)
+        self._worker.signals.error.connect(self._on_mapping_error)
+        self._worker.start()
+    
+    def _map_fields_task(self, progress_callback=None):
+        """Worker task computing the AI field mapping"""
+        return self.quantize_ai.map_fields(self.dataframe)
+    
+    def _on_mapping_done(self, field_mapping):
+        """Populate the UI with the AI mapping results"""
         try:
-            # Get AI field mapping
-            self.field_mapping = self.quantize_ai.map_fields(self.dataframe)
+            self.field_mapping = field_mapping
             
             # Display in table
             self.populate_mapping_table()
@@ -121,44 +144,60 @@ class FieldMapperDialog(QDialog):
             self.update_preview()
             
         except Exception as e:
-            logger.error(f"Error in AI field mapping: {str(e)}")
-            self.progress_label.setText(f"Error in analysis: {str(e)}")
-            self.progress_bar.setRange(0, 100)
-            self.progress_bar.setValue(0)
+            self._on_mapping_error(str(e))
+    
+    def _on_mapping_error(self, message):
+        """Show an AI mapping failure in the dialog"""
+        logger.error(f"Error in AI field mapping: {message}")
+        self.progress_label.setText(f"Error in analysis: {message}")
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+    
+    def done(self, result):
+        """Close the dialog, detaching from a mapping that is still running"""
+        if self._worker is not None and self._worker.is_running():
+            self._worker.cancel()
+            self._worker.signals.finished_with_result.disconnect(self._on_mapping_done)
+            self._worker.signals.error.disconnect(self._on_mapping_error)
+        super().done(result)
     
     def populate_mapping_table(self):
         """Populate the mapping table with columns and their suggested mappings"""
         self.mapping_table.setRowCount(len(self.dataframe.columns))
         
-        for row, column in enumerate(self.dataframe.columns):
-            # Original field name
-            self.mapping_table.setItem(row, 0, QTableWidgetItem(column))
-            
-            # Sample data (first non-null value)
-            sample_value = ""
-            for value in self.dataframe[column].dropna():
-                sample_value = str(value)
-                if sample_value.strip():
-                    break
-            self.mapping_table.setItem(row, 1, QTableWidgetItem(sample_value[:50]))
-            
-            # Mapped field dropdown
-            field_dropdown = QComboBox()
-            field_dropdown.addItem("-- Skip Field --")
-            
-            for field in self.standard_fields:
-                field_dropdown.addItem(field)
-            
-            # Set selected field based on AI mapping
-            mapped_field = self.field_mapping.get(column)
-            if mapped_field:
-                index = field_dropdown.findText(mapped_field)
-                field_dropdown.setCurrentIndex(index if index != -1 else 0)
-            
-            field_dropdown.currentTextChanged.connect(
-                lambda text, col=column: self.update_field_mapping(col, text)
-            )
-            self.mapping_table.setCellWidget(row, 2, field_dropdown)
+        # Sample data (first non-blank value), looking only at the first rows of each column
+        head = self.dataframe.head(100)
+        samples = {
+            column: next((str(v) for v in head[column] if pd.notna(v) and str(v).strip()), "")
+            for column in self.dataframe.columns
+        }
+        
+        # Suspend repaints while the rows are built; one repaint at the end
+        self.mapping_table.setUpdatesEnabled(False)
+        try:
+            for row, column in enumerate(self.dataframe.columns):
+                # Original field name
+                self.mapping_table.setItem(row, 0, QTableWidgetItem(column))
+                
+                self.mapping_table.setItem(row, 1, QTableWidgetItem(samples[column][:50]))
+                
+                # Mapped field dropdown
+                field_dropdown = QComboBox()
+                field_dropdown.blockSignals(True)
+                field_dropdown.addItems(self._field_items)
+                
+                # Set selected field based on AI mapping
+                mapped_field = self.field_mapping.get(column)
+                field_dropdown.setCurrentIndex(self._field_index.get(mapped_field, 0))
+                field_dropdown.blockSignals(False)
+                
+                # Connect only once the initial selection is set, so setup doesn't trigger preview rebuilds
+                field_dropdown.currentTextChanged.connect(
+                    lambda text, col=column: self.update_field_mapping(col, text)
+                )
+                self.mapping_table.setCellWidget(row, 2, field_dropdown)
+        finally:
+            self.mapping_table.setUpdatesEnabled(True)
     
     def update_field_mapping(self, column, mapped_field):
         """
@@ -178,20 +217,19 @@ class FieldMapperDialog(QDialog):
     
     def update_preview(self):
         """Update the preview table with transformed data"""
-        # Get mapped subset of data (first 5 rows)
-        preview_data = self.dataframe.head(5).copy()
+        # Only the headers depend on the mapping
+        mapped_cols = [self.field_mapping.get(col, col) for col in self._preview_head.columns]
+        
+        if not self._preview_filled:
+            n_rows, n_cols = self._preview_strings.shape
+            self.preview_table.setRowCount(n_rows)
+            self.preview_table.setColumnCount(n_cols)
+            for row in range(n_rows):
+                for col in range(n_cols):
+                    self.preview_table.setItem(row, col, QTableWidgetItem(self._preview_strings[row, col]))
+            self._preview_filled = True
         
-        # Set up preview table
-        mapped_cols = [self.field_mapping.get(col, col) for col in preview_data.columns]
-        self.preview_table.setRowCount(min(5, len(preview_data)))
-        self.preview_table.setColumnCount(len(mapped_cols))
         self.preview_table.setHorizontalHeaderLabels(mapped_cols)
-        
-        # Fill data
-        for row in range(min(5, len(preview_data))):
-            for col, orig_col in enumerate(preview_data.columns):
-                value = str(preview_data.iloc[row, col])
-                self.preview_table.setItem(row, col, QTableWidgetItem(value))
     
     def apply_mapping(self):
         """Apply the field mapping and emit the completed mapping dict"""
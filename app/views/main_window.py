@@ -2,39 +2,33 @@
 Simplified Main window implementation for Education Data Cleaning Tool.
 """
 
+import io
 import os
 import sys
 import time
 import logging
+import string
+import datetime
+import hashlib
 import threading
-import platform
-import subprocess
+import traceback
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Qt5Agg')
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QLabel, QFileDialog, QTableView, 
     QComboBox, QProgressBar, QMessageBox, QTabWidget,
     QCheckBox, QSpinBox, QGroupBox, QFormLayout,
     QFrame, QStatusBar, QLineEdit, QDialog, QTextEdit,
-    QProgressDialog, QTabWidget
+    QProgressDialog, QTabWidget, QSpacerItem, QSizePolicy, QDialogButtonBox
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QSize, QTimer, QThreadPool, QRunnable, QObject, pyqtSlot
-from PyQt6.QtGui import QAction, QPixmap, QFont
+from PyQt6.QtGui import QAction, QPixmap, QImage, QFont, QTextCursor
 
 from app.controllers.data_cleaner import DataCleaner
 from app.models.data_model import PandasTableModel, CleaningOptions
-from app.views.field_mapper_dialog import FieldMapperDialog
 from app.views.run_quantize import run_field_mapping, apply_field_mapping
-
-# Matplotlib for analytics tab
-import matplotlib
-matplotlib.use('Agg')  # Offscreen canvas for headless runs
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
 from app.utils.image_ocr import PhotoProcessor
 from app.utils.excel_safeguard import ExcelSafeguard
 
@@ -72,6 +66,8 @@ class Worker(QRunnable):
     :param kwargs: Keywords to pass to the callback function
     '''
 
+    PROGRESS_INTERVAL = 0.1  # Minimum seconds between forwarded progress updates
+
     def __init__(self, fn, *args, **kwargs):
         super(Worker, self).__init__()
         # Store constructor arguments (re-used for processing)
@@ -79,9 +75,20 @@ class Worker(QRunnable):
         self.args = args
         self.kwargs = kwargs
         self.signals = WorkerSignals()
+        self._last_progress_emit = 0.0
 
         # Add the callback to our kwargs
-        self.kwargs['progress_callback'] = self.signals.progress.emit
+        self.kwargs['progress_callback'] = self._emit_progress
+
+    def _emit_progress(self, percent, message):
+        '''
+        Forward progress to the GUI thread, coalescing updates that arrive
+        less than PROGRESS_INTERVAL apart. Completion (100%) is always sent.
+        '''
+        now = time.monotonic()
+        if percent >= 100 or now - self._last_progress_emit >= self.PROGRESS_INTERVAL:
+            self._last_progress_emit = now
+            self.signals.progress.emit(percent, message)
 
     @pyqtSlot()
     def run(self):
@@ -91,10 +98,11 @@ class Worker(QRunnable):
         # Retrieve args/kwargs here; and fire processing using them
         try:
             result = self.fn(*self.args, **self.kwargs)
-        except:
-            traceback.print_exc()
-            exctype, value = sys.exc_info()[:2]
-            self.signals.error.emit((exctype, value, traceback.format_exc()))
+        except Exception as e:
+            # Formatting the traceback is only worth it when someone will read it
+            tb = traceback.format_exc() if logger.isEnabledFor(logging.DEBUG) else ''
+            logger.error(f"Worker task failed: {e}")
+            self.signals.error.emit((type(e), e, tb))
         else:
             self.signals.result.emit(result)  # Return the result of the processing
         finally:
@@ -106,6 +114,35 @@ logger = logging.getLogger(__name__)
 class MainWindow(QMainWindow):
     """Main application window for the Education Data Cleaning Tool"""
     
+    ANALYTICS_CACHE_SIZE = 4  # Rendered analytics images kept for re-use
+    SEARCH_DEBOUNCE_MS = 150  # Idle time after the last keystroke before searching
+    REPORT_CHUNK_SIZE = 64 * 1024  # Characters appended to the report view per event-loop pass
+    OCR_CACHE_SIZE = 128  # Single-photo OCR results kept, keyed by image content
+    ANALYTICS_SAMPLE_ROWS = 100_000  # Larger frames are sampled for the category chart
+    PHOTO_THUMBNAIL_SIZE = 200  # Bounding box of the photo preview in the OCR results dialog
+    SETTINGS_WARMUP_MS = 500  # Delay after startup before the settings dialog is pre-built
+    
+    # HTML for the single-photo OCR results dialog, parsed once
+    _OCR_RESULT_HTML = string.Template(
+        "<h3>Extracted Student Information</h3>"
+        "<p><b>File:</b> $file<br>"
+        "<b>Student ID:</b> $student_id<br>"
+        "<b>Name:</b> $name<br>"
+        "<b>Date of Birth:</b> $dob</p>"
+        "<p><i>Note: OCR results may require verification</i></p>"
+        "<h3>Face Detection Results</h3><p>$face_info</p>"
+    )
+    _FACE_FOUND_HTML = string.Template(
+        "<b>Face Detected:</b> <span style='color:green'>Yes</span><br>"
+        "<b>Number of Faces:</b> $face_count"
+    )
+    _FACE_MISSING_HTML = "<b>Face Detected:</b> <span style='color:red'>No</span>"
+    
+    # Analytics figure and axes, created on the first render and re-used afterwards
+    _analytics_fig = None
+    _analytics_axs = None
+    _analytics_fig_lock = threading.Lock()
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Education Data Cleaning Tool")
@@ -115,9 +152,29 @@ class MainWindow(QMainWindow):
         self.data_cleaner = DataCleaner()
         self.options = CleaningOptions()
         self.preview_model = PandasTableModel()
+        self.data = None  # Loaded frame used by Quantize AI field mapping
+        self._column_samples = None  # Per-column samples of self.data, built on first mapping
         self.threadpool = QThreadPool()
         logger.info(f"Multithreading with maximum {self.threadpool.maxThreadCount()} threads")
         
+        # Search runs once typing pauses rather than on every keystroke
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._do_search)
+        
+        # OCR results keyed by photo content hash, most recent last
+        self._ocr_cache = OrderedDict()
+        self._ocr_cache_lock = threading.Lock()
+        
+        # Rendered analytics PNGs keyed by (columns, row count), most recent last
+        self._analytics_cache = OrderedDict()
+        self._analytics_key = None
+        
+        # Settings dialog, pre-built once the window is up so the first open is instant
+        self._settings_dialog = None
+        QTimer.singleShot(self.SETTINGS_WARMUP_MS, self._warm_settings)
+        
         # Setup the UI
         self.setup_ui()
         self.setup_menu()
@@ -240,9 +297,10 @@ class MainWindow(QMainWindow):
         analytics_tab = QWidget()
         analytics_layout = QVBoxLayout(analytics_tab)
 
-        # Matplotlib canvas
-        self.analytics_canvas = FigureCanvas(plt.Figure(figsize=(6,4)))
-        analytics_layout.addWidget(self.analytics_canvas)
+        # Charts are rendered to an image off the GUI thread and shown here
+        self.analytics_label = QLabel("Load a data file to see analytics.")
+        self.analytics_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        analytics_layout.addWidget(self.analytics_label)
         self.tabs.addTab(analytics_tab, "Analytics")
 
         # Set central widget to tabs
@@ -270,6 +328,10 @@ class MainWindow(QMainWindow):
         file_menu.addAction(export_action)
         self.export_action = export_action
         
+        settings_action = QAction("&Settings...", self)
+        settings_action.triggered.connect(self.open_settings)
+        file_menu.addAction(settings_action)
+        
         file_menu.addSeparator()
         
         exit_action = QAction("E&xit", self)
@@ -281,6 +343,9 @@ class MainWindow(QMainWindow):
         process_photo_action = QAction("Process Student &Photos...", self)
         process_photo_action.triggered.connect(self.browse_student_photo)
         ocr_menu.addAction(process_photo_action)
+        process_batch_action = QAction("Process Photo &Batch...", self)
+        process_batch_action.triggered.connect(self.browse_student_photo_batch)
+        ocr_menu.addAction(process_batch_action)
         
         # Help menu
         help_menu = self.menuBar().addMenu("&Help")
@@ -327,28 +392,49 @@ class MainWindow(QMainWindow):
     def on_load_complete(self, result: dict):
         """Handles the successful completion of the file loading thread."""
         if result and result.get('success'):
-            self.status_bar.showMessage("Data loaded successfully.", 5000)
             self.progress_bar.setValue(100)
             
             preview_df = result.get('preview_df')
             temp_csv_path = result.get('temp_csv_path')
+            
+            total_rows = result.get('total_rows')
+            if preview_df is not None and total_rows and total_rows > len(preview_df):
+                self.status_bar.showMessage(
+                    f"Data loaded successfully. Previewing the first {len(preview_df):,} of {total_rows:,} rows.", 5000)
+            else:
+                self.status_bar.showMessage("Data loaded successfully.", 5000)
 
             if preview_df is not None and temp_csv_path:
+                columns = preview_df.columns.tolist()
+                
                 # This is the non-blocking call to prepare the data cleaner
                 load_success = self.data_cleaner.load_data(
                     temp_csv_path=temp_csv_path, 
-                    columns=preview_df.columns.tolist()
+                    columns=columns
                 )
                 
                 if load_success:
+                    # Phase 1: the preview is usable right away
+                    self.data = preview_df
+                    self._column_samples = None
                     self.preview_model.setData(preview_df)
                     self._update_analytics(preview_df)
-                    self._update_column_selectors()
-                    self._auto_select_columns(self.data_cleaner.get_columns())
+                    self._update_column_selectors(columns)
+                    self._auto_select_columns(columns)
                     
-                    self.process_data_btn.setEnabled(True)
+                    # Processing needs the full data set, so it waits for phase 2 instead of reading it again
+                    needs_full_load = bool(total_rows and total_rows > len(preview_df))
+                    self.process_data_btn.setEnabled(not needs_full_load)
                     self.quantize_btn.setEnabled(True)
                     self.export_btn.setEnabled(False)
+                    
+                    # Phase 2: read the full data set while the user configures columns
+                    if needs_full_load:
+                        worker = Worker(self.data_cleaner.finalize_load)
+                        worker.signals.result.connect(self._on_full_data_loaded)
+                        worker.signals.error.connect(self.on_load_error)
+                        worker.signals.progress.connect(self._update_status)
+                        self.threadpool.start(worker)
                 else:
                     self.on_load_error(("Failed to prepare data for processing.", ""))
             else:
@@ -357,9 +443,28 @@ class MainWindow(QMainWindow):
             error_message = result.get('error', 'An unknown error occurred during loading.')
             self.on_load_error((error_message, ""))
 
+    def _on_full_data_loaded(self, result):
+        """Switch the preview, search and analytics over to the fully loaded data set."""
+        # Ignore results for a file that has since been replaced
+        if result['temp_csv_path'] != self.data_cleaner.temp_file_path:
+            return
+        
+        data = result['data']
+        self.data = data
+        self._column_samples = None
+        self.preview_model.setData(data)
+        self.search_input.clear()
+        self._update_analytics(data)
+        self.process_data_btn.setEnabled(True)
+        
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(100)
+        self.status_bar.showMessage(f"All {result['total_records']:,} rows loaded.", 5000)
+
     def on_load_error(self, error_info):
         """Handles errors from the file loading thread."""
-        error_message, traceback_info = error_info
+        # Worker errors are (type, value, traceback); local callers pass (message, traceback)
+        error_message, traceback_info = error_info[-2:]
         logger.error(f"File loading failed: {error_message}")
         self.progress_bar.setValue(0)
         self.status_bar.showMessage(f"Error: {error_message}", 5000)
@@ -373,55 +478,45 @@ class MainWindow(QMainWindow):
             msg.setDetailedText(str(traceback_info))
         msg.exec()
 
-    def _update_column_selectors(self):
-        """Update column selector dropdowns with current DataFrame columns"""
-        columns = self.data_cleaner.get_columns()
-        
-        # Clear existing items
-        self.name_combo.clear()
-        self.dob_combo.clear()
-        self.year_combo.clear()
-        self.photo_column_combo.clear()
-        
-        # Add placeholder
-        self.name_combo.addItem("-- Select Name Column --")
-        self.dob_combo.addItem("-- Select Date of Birth Column --")
-        self.year_combo.addItem("-- Select Academic Year Column --")
-        self.photo_column_combo.addItem("-- Select Photo Column --")
-        
-        # Add columns
-        for col in columns:
-            self.name_combo.addItem(col)
-            self.dob_combo.addItem(col)
-            self.year_combo.addItem(col)
-            self.photo_column_combo.addItem(col)
+    def _update_column_selectors(self, columns=None):
+        """Update column selector dropdowns with the given (or the cleaner's current) columns"""
+        if columns is None:
+            columns = self.data_cleaner.get_columns()
+        
+        selectors = (
+            (self.name_combo, "-- Select Name Column --"),
+            (self.dob_combo, "-- Select Date of Birth Column --"),
+            (self.year_combo, "-- Select Academic Year Column --"),
+            (self.photo_column_combo, "-- Select Photo Column --"),
+        )
+        
+        # Placeholder plus all columns in one bulk insert per combo, without intermediate signals
+        for combo, placeholder in selectors:
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItems([placeholder] + list(columns))
+            combo.blockSignals(False)
+
+    # Keywords used to guess each column selector, checked in order
+    AUTO_SELECT_KEYWORDS = {
+        'name_combo': ('name', 'student', 'pupil'),
+        'dob_combo': ('birth', 'dob', 'date'),
+        'year_combo': ('year', 'grade', 'class'),
+        'photo_column_combo': ('photo', 'image', 'picture'),
+    }
 
     def _auto_select_columns(self, columns):
         """Try to auto-select appropriate columns based on names"""
-        columns_lower = [col.lower() for col in columns]
+        remaining = dict(self.AUTO_SELECT_KEYWORDS)
         
-        # Try to find name column
-        for i, col_lower in enumerate(columns_lower):
-            if any(name_kw in col_lower for name_kw in ['name', 'student', 'pupil']):
-                self.name_combo.setCurrentIndex(i + 1)  # +1 for placeholder
-                break
-        
-        # Try to find DOB column
-        for i, col_lower in enumerate(columns_lower):
-            if any(dob_kw in col_lower for dob_kw in ['birth', 'dob', 'date']):
-                self.dob_combo.setCurrentIndex(i + 1)
-                break
-        
-        # Try to find academic year column
-        for i, col_lower in enumerate(columns_lower):
-            if any(year_kw in col_lower for year_kw in ['year', 'grade', 'class']):
-                self.year_combo.setCurrentIndex(i + 1)
-                break
-
-        # Try to find photo column
-        for i, col_lower in enumerate(columns_lower):
-            if any(photo_kw in col_lower for photo_kw in ['photo', 'image', 'picture']):
-                self.photo_column_combo.setCurrentIndex(i + 1)
+        # Single pass over the columns; each selector takes the first column matching its keywords
+        for i, col in enumerate(columns):
+            col_lower = col.lower()
+            for combo_name, keywords in list(remaining.items()):
+                if any(kw in col_lower for kw in keywords):
+                    getattr(self, combo_name).setCurrentIndex(i + 1)  # +1 for placeholder
+                    del remaining[combo_name]
+            if not remaining:
                 break
     
     def process_data(self):
@@ -469,8 +564,8 @@ class MainWindow(QMainWindow):
         self.options.name_column = self.name_combo.currentText()
         self.options.dob_column = self.dob_combo.currentText() if self.dob_combo.currentIndex() > 0 else None
         self.options.year_column = self.year_combo.currentText() if self.year_combo.currentIndex() > 0 else None
-        self.options.fuzzy_match = self.fuzzy_check.isChecked()
-        self.options.match_threshold = self.threshold_spin.value()
+        self.options.fuzzy_matching = self.fuzzy_check.isChecked()
+        self.options.fuzzy_threshold = self.threshold_spin.value()
 
         self.status_bar.showMessage("Processing data...")
         self.progress_bar.setValue(0)
@@ -510,16 +605,19 @@ class MainWindow(QMainWindow):
         num_duplicates = len(result)
         self.status_bar.showMessage(f"Photo processing complete. Found {num_duplicates} potential duplicate sets.")
         
-        log_message = "Photo Duplicate Analysis Results:\n"
+        buf = io.StringIO()
+        buf.write("Photo Duplicate Analysis Results:\n")
         if not result:
-            log_message += "No duplicates found based on facial similarity."
+            buf.write("No duplicates found based on facial similarity.")
         else:
             for i, duplicate_set in enumerate(result):
-                log_message += f"\nSet {i+1}:\n"
-                for student_info in duplicate_set:
-                    log_message += f"  - Name: {student_info['name']}, File: {student_info['photo_file']}\n"
+                buf.write(f"\nSet {i+1}:\n")
+                buf.writelines(
+                    f"  - Name: {student_info['name']}, File: {student_info['photo_file']}\n"
+                    for student_info in duplicate_set
+                )
         
-        logger.info(log_message)
+        logger.info(buf.getvalue())
         
         msg_box = QMessageBox(self)
         msg_box.setIcon(QMessageBox.Icon.Information)
@@ -563,132 +661,167 @@ class MainWindow(QMainWindow):
         duplicate_path = os.path.join(export_dir, f"duplicate_data_{timestamp}.csv")
         report_path = os.path.join(export_dir, f"cleaning_report_{timestamp}.txt")
         
-        # Update UI
+        # Update UI; export stays disabled until this export finishes
         self.progress_bar.setValue(0)
         self.status_bar.showMessage("Exporting data...")
+        self.export_btn.setEnabled(False)
+        self.export_action.setEnabled(False)
         
-        try:
-            # Export the data
-            self.progress_bar.setValue(10)
-            self.data_cleaner.export_clean_data(clean_path)
-            
-            self.progress_bar.setValue(40)
-            self.data_cleaner.export_duplicate_data(duplicate_path)
-            
-            self.progress_bar.setValue(70)
-            
-            # Generate and save the report
-            report_content = self._generate_report(clean_path, duplicate_path)
-            
-            with open(report_path, "w") as report_file:
-                report_file.write(report_content)
-                
-            self.progress_bar.setValue(90)
-            
-            # Update UI
-            self.progress_bar.setValue(100)
-            self.status_bar.showMessage(f"Data exported to {export_dir}")
-            
-            # Show report dialog
-            report_dialog = QDialog(self)
-            report_dialog.setWindowTitle("Cleaning Report")
-            report_dialog.resize(600, 500)
-            
-            layout = QVBoxLayout(report_dialog)
-            
-            # Report text
-            report_text = QTextEdit()
-            report_text.setReadOnly(True)
-            report_text.setFont(QFont("Courier New", 10))
-            report_text.setText(report_content)
-            
-            # Buttons
-            buttons_layout = QHBoxLayout()
-            open_report_btn = QPushButton("Open Report")
-            open_clean_btn = QPushButton("Open Clean Data")
-            open_duplicates_btn = QPushButton("Open Duplicates")
-            close_btn = QPushButton("Close")
-            
-            buttons_layout.addWidget(open_report_btn)
-            buttons_layout.addWidget(open_clean_btn)
-            buttons_layout.addWidget(open_duplicates_btn)
-            buttons_layout.addStretch(1)
-            buttons_layout.addWidget(close_btn)
-            
-            layout.addWidget(report_text)
-            layout.addLayout(buttons_layout)
-            
-            # Connect buttons
-            def open_file(path):
-                if platform.system() == 'Darwin':  # macOS
-                    os.system(f'open "{path}"')
-                elif platform.system() == 'Windows':  # Windows
-                    os.system(f'start "" "{path}"')
-                else:  # linux variants
-                    os.system(f'xdg-open "{path}"')
-
-            open_report_btn.clicked.connect(lambda: open_file(report_path))
-            open_clean_btn.clicked.connect(lambda: open_file(clean_path))
-            open_duplicates_btn.clicked.connect(lambda: open_file(duplicate_path))
-            close_btn.clicked.connect(report_dialog.accept)
-
-            report_dialog.exec()
+        worker = Worker(self._do_export, clean_path, duplicate_path, report_path)
+        worker.signals.result.connect(self._show_export_report)
+        worker.signals.error.connect(self.on_export_error)
+        worker.signals.progress.connect(self._update_status)
+        worker.signals.finished.connect(lambda: self.export_btn.setEnabled(True))
+        worker.signals.finished.connect(lambda: self.export_action.setEnabled(True))
+        self.threadpool.start(worker)
 
-        except Exception as e:
-            self.progress_bar.setValue(0)
-            self.status_bar.showMessage(f"Error: {str(e)}")
-            QMessageBox.critical(self, "Error", f"An error occurred during export: {str(e)}")
+    def _do_export(self, clean_path, duplicate_path, report_path, progress_callback):
+        """Write the clean data, duplicate data and report files (runs on the thread pool)"""
+        progress_callback(10, "Exporting clean data...")
+        self.data_cleaner.export_clean_data(clean_path)
+        
+        progress_callback(40, "Exporting duplicate data...")
+        self.data_cleaner.export_duplicate_data(duplicate_path)
+        
+        progress_callback(70, "Writing report...")
+        with open(report_path, "w", encoding="utf-8") as report_file:
+            self._generate_report(clean_path, duplicate_path, report_file)
+        
+        return {
+            'clean_path': clean_path,
+            'duplicate_path': duplicate_path,
+            'report_path': report_path
+        }
+
+    def _show_export_report(self, result):
+        """Show the cleaning report once the export has finished"""
+        clean_path = result['clean_path']
+        duplicate_path = result['duplicate_path']
+        report_path = result['report_path']
+        
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(100)
+        self.status_bar.showMessage(f"Data exported to {os.path.dirname(report_path)}")
+        
+        # Show report dialog
+        report_dialog = QDialog(self)
+        report_dialog.setWindowTitle("Cleaning Report")
+        report_dialog.resize(600, 500)
+        
+        layout = QVBoxLayout(report_dialog)
+        
+        # Report text
+        report_text = QTextEdit()
+        report_text.setReadOnly(True)
+        report_text.setFont(QFont("Courier New", 10))
+        self._load_text_incrementally(report_text, report_path)
+        
+        # Buttons
+        buttons_layout = QHBoxLayout()
+        open_report_btn = QPushButton("Open Report")
+        open_clean_btn = QPushButton("Open Clean Data")
+        open_duplicates_btn = QPushButton("Open Duplicates")
+        close_btn = QPushButton("Close")
+        
+        buttons_layout.addWidget(open_report_btn)
+        buttons_layout.addWidget(open_clean_btn)
+        buttons_layout.addWidget(open_duplicates_btn)
+        buttons_layout.addStretch(1)
+        buttons_layout.addWidget(close_btn)
+        
+        layout.addWidget(report_text)
+        layout.addLayout(buttons_layout)
+        
+        # Connect buttons
+        def open_file(path):
+            import platform
+            if platform.system() == 'Darwin':  # macOS
+                os.system(f'open "{path}"')
+            elif platform.system() == 'Windows':  # Windows
+                os.system(f'start "" "{path}"')
+            else:  # linux variants
+                os.system(f'xdg-open "{path}"')
+        
+        open_report_btn.clicked.connect(lambda: open_file(report_path))
+        open_clean_btn.clicked.connect(lambda: open_file(clean_path))
+        open_duplicates_btn.clicked.connect(lambda: open_file(duplicate_path))
+        close_btn.clicked.connect(report_dialog.accept)
+        
+        report_dialog.exec()
 
-    def _generate_report(self, clean_path, duplicate_path):
-        """Generate a detailed report of the data cleaning process"""
-        stats = self.data_cleaner.get_summary_report()
+    def on_export_error(self, error_tuple):
+        """Handle errors from the export worker"""
+        logger.error(f"Export error: {error_tuple[1]}\n{error_tuple[2]}")
+        self.progress_bar.setValue(0)
+        self.status_bar.showMessage(f"Error: {error_tuple[1]}")
+        QMessageBox.critical(self, "Error", f"An error occurred during export: {error_tuple[1]}")
+
+    def _generate_report(self, clean_path, duplicate_path, out_file):
+        """Write a detailed report of the data cleaning process to out_file, line by line"""
+        stats = self.data_cleaner.get_summary_report() or {}
+        
+        def line(text):
+            out_file.write(text + "\n")
         
-        report = []
-        report.append("===============================================")
-        report.append("           EDUCATION DATA CLEANING REPORT           ")
-        report.append("===============================================")
-        report.append(f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append("")
+        line("===============================================")
+        line("           EDUCATION DATA CLEANING REPORT           ")
+        line("===============================================")
+        line(f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        line("")
         
         # Input file information
-        report.append("INPUT FILE INFORMATION")
-        report.append("-----------------------")
-        report.append(f"File Path: {stats.get('file_path', 'Unknown')}")
-        report.append(f"File Type: {stats.get('file_type', 'Unknown').upper()}")
-        report.append(f"Total Records: {stats.get('total_records', 0)}")
-        report.append(f"Columns: {stats.get('columns', 0)}")
-        report.append(f"Loaded At: {stats.get('loaded_at', '-')}")
-        report.append("")
+        line("INPUT FILE INFORMATION")
+        line("-----------------------")
+        line(f"File Path: {stats.get('file_path', 'Unknown')}")
+        line(f"File Type: {stats.get('file_type', 'Unknown').upper()}")
+        line(f"Total Records: {stats.get('total_records', 0)}")
+        line(f"Columns: {stats.get('columns', 0)}")
+        line(f"Loaded At: {stats.get('loaded_at', '-')}")
+        line("")
         
         # Cleaning configuration
-        report.append("CLEANING CONFIGURATION")
-        report.append("---------------------")
-        report.append(f"Name Column: {self.options.name_column}")
-        report.append(f"Date of Birth Column: {self.options.dob_column}")
-        report.append(f"Academic Year Column: {self.options.year_column}")
-        report.append(f"Fuzzy Matching: {'Enabled' if self.options.fuzzy_matching else 'Disabled'}")
+        line("CLEANING CONFIGURATION")
+        line("---------------------")
+        line(f"Name Column: {self.options.name_column}")
+        line(f"Date of Birth Column: {self.options.dob_column}")
+        line(f"Academic Year Column: {self.options.year_column}")
+        line(f"Fuzzy Matching: {'Enabled' if self.options.fuzzy_matching else 'Disabled'}")
         if self.options.fuzzy_matching:
-            report.append(f"Fuzzy Threshold: {self.options.fuzzy_threshold}%")
-        report.append("")
+            line(f"Fuzzy Threshold: {self.options.fuzzy_threshold}%")
+        line("")
         
         # Results
-        report.append("CLEANING RESULTS")
-        report.append("---------------")
-        report.append(f"Clean Records: {stats.get('clean_records', 0)} ({stats.get('clean_records', 0)/stats.get('total_records', 1)*100:.1f}%)")
-        report.append(f"Duplicate Records: {stats.get('duplicate_records', 0)} ({stats.get('duplicate_records', 0)/stats.get('total_records', 1)*100:.1f}%)")
-        report.append("")
+        line("CLEANING RESULTS")
+        line("---------------")
+        line(f"Clean Records: {stats.get('clean_records', 0)} ({stats.get('clean_records', 0)/stats.get('total_records', 1)*100:.1f}%)")
+        line(f"Duplicate Records: {stats.get('duplicate_records', 0)} ({stats.get('duplicate_records', 0)/stats.get('total_records', 1)*100:.1f}%)")
+        line("")
         
         # Export information
-        report.append("EXPORTED FILES")
-        report.append("--------------")
-        report.append(f"Clean Data: {clean_path}")
-        report.append(f"Duplicate Data: {duplicate_path}")
-        report.append("")
+        line("EXPORTED FILES")
+        line("--------------")
+        line(f"Clean Data: {clean_path}")
+        line(f"Duplicate Data: {duplicate_path}")
+        line("")
         
-        report.append("===============================================")
-        report.append("End of Report")
+        line("===============================================")
+        line("End of Report")
+
+    def _load_text_incrementally(self, text_edit, path):
+        """Append a text file to text_edit in chunks from the event loop so the dialog opens at once"""
+        text_file = open(path, "r", encoding="utf-8")
         
-        return "\n".join(report)
+        def append_next_chunk():
+            chunk = text_file.read(self.REPORT_CHUNK_SIZE)
+            if not chunk:
+                text_file.close()
+                return
+            cursor = text_edit.textCursor()
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertText(chunk)
+            QTimer.singleShot(0, append_next_chunk)
+        
+        QTimer.singleShot(0, append_next_chunk)
 
     def show_about(self):
         """Show the about dialog"""
@@ -699,8 +832,15 @@ class MainWindow(QMainWindow):
             " 2025"
         )
 
+    def _warm_ocr(self, progress_callback=None):
+        """Start tesseract once ahead of the first photo (runs on the thread pool)"""
+        from app.utils.image_ocr import image_ocr
+        image_ocr.warmup()
+
     def browse_student_photo(self):
         """Open file dialog to select student photo for OCR processing"""
+        # Warm up OCR while the user is still picking a file
+        self.threadpool.start(Worker(self._warm_ocr))
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "Select Student Photo",
@@ -708,52 +848,110 @@ class MainWindow(QMainWindow):
             "Image Files (*.jpg *.jpeg *.png);;All Files (*)"
         )
         
-        if file_path:
-            try:
-                # Show progress dialog
-                progress = QProgressDialog("Processing photo...", "Cancel", 0, 100, self)
-                progress.setWindowModality(Qt.WindowModality.WindowModal)
-                progress.setMinimumDuration(0)
-                progress.setValue(10)
-                
-                # Process in a separate thread to keep UI responsive
-                self.ocr_thread = threading.Thread(
-                    target=self.process_student_photo,
-                    args=(file_path, progress)
-                )
-                self.ocr_thread.daemon = True
-                self.ocr_thread.start()
-                
-                # Create a timer to check status
-                self.ocr_timer = QTimer()
-                self.ocr_timer.timeout.connect(
-                    lambda: self.check_ocr_status(progress)
-                )
-                self.ocr_timer.start(100)  # Check every 100ms
-                
-            except Exception as e:
-                logging.error(f"Error setting up OCR processing: {str(e)}")
-                QMessageBox.critical(self, "Error", f"Error setting up OCR processing: {str(e)}")
+        if not file_path:
+            return
+            
+        # Show a busy dialog; OCR has no meaningful intermediate steps, and it closes when the worker finishes
+        progress = QProgressDialog("Processing photo...", "Cancel", 0, 0, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        
+        worker = Worker(self.process_student_photo, file_path)
+        # Completion is delivered by signal; a cancelled dialog just drops the result
+        worker.signals.result.connect(
+            lambda results: None if progress.wasCanceled() else self._on_single_photo_done(results)
+        )
+        worker.signals.finished.connect(progress.close)
+        self.threadpool.start(worker)
+
+    def browse_student_photo_batch(self):
+        """Open file dialog to select several student photos for OCR processing"""
+        # Warm up OCR (and the OS cache of its language data) while the user is still picking files
+        self.threadpool.start(Worker(self._warm_ocr))
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            "Select Student Photos",
+            "",
+            "Image Files (*.jpg *.jpeg *.png);;All Files (*)"
+        )
+        
+        if not file_paths:
+            return
+            
+        self.status_bar.showMessage(f"Processing {len(file_paths)} photos...")
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        
+        worker = Worker(self.process_student_photos_batch, file_paths)
+        worker.signals.result.connect(self._on_photo_batch_done)
+        worker.signals.error.connect(self.on_processing_error)
+        worker.signals.progress.connect(self._update_status)
+        self.threadpool.start(worker)
+
+    def process_student_photos_batch(self, file_paths, progress_callback=None):
+        """Process several student photos with OCR across worker processes (runs on the thread pool)"""
+        from app.utils.image_ocr import process_student_images
+        return process_student_images(file_paths, progress_callback=progress_callback)
+
+    def _on_photo_batch_done(self, results):
+        """Summarise the OCR results for a batch of student photos"""
+        self.progress_bar.setValue(100)
+        failed = sum(1 for result in results if 'error' in result)
+        faces = sum(1 for result in results if result.get('face_detected'))
+        self.status_bar.showMessage(f"Processed {len(results)} photos.")
+        
+        buf = io.StringIO()
+        buf.write("Photo Batch OCR Results:\n")
+        buf.writelines(
+            f"  - File: {os.path.basename(result['image_path'])}, ID: {result.get('student_id')}, "
+            f"Name: {result.get('name')}, Faces: {result.get('face_count', 0)}\n"
+            for result in results
+        )
+        logger.info(buf.getvalue())
+        
+        QMessageBox.information(self, "Photo Batch Complete",
+                                f"Processed {len(results)} photos.\n\n"
+                                f"Faces detected: {faces}\n"
+                                f"Failed: {failed}\n\n"
+                                f"Check the logs for a detailed report.")
+
+    def _photo_cache_key(self, image_bytes):
+        """Return a content hash identifying a photo for the OCR cache"""
+        return hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
 
-    def process_student_photo(self, file_path, progress=None):
-        """Process the student photo with OCR to extract information"""
+    def _load_photo_thumbnail(self, image_bytes):
+        """Decode a photo as a QImage no larger than the preview box (safe to run off the GUI thread)"""
+        image = QImage.fromData(image_bytes)
+        size = self.PHOTO_THUMBNAIL_SIZE
+        if image.width() > size or image.height() > size:
+            image = image.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+        return image
+
+    def process_student_photo(self, file_path, progress_callback=None):
+        """Process the student photo with OCR to extract information (runs on the thread pool)"""
         try:
             # Import OCR utility here to avoid circular imports
             from app.utils.image_ocr import process_student_image
             
-            # Update progress
-            if progress:
-                progress.setValue(30)
+            # Read the photo once; hashing, the thumbnail and OCR all work from this buffer
+            with open(file_path, 'rb') as f:
+                image_bytes = f.read()
             
-            # Process the image
-            result = process_student_image(file_path)
+            # Re-selecting a photo we've already processed is answered from the cache
+            key = self._photo_cache_key(image_bytes)
+            with self._ocr_cache_lock:
+                cached = self._ocr_cache.get(key)
+                if cached is not None:
+                    self._ocr_cache.move_to_end(key)
+                    return dict(cached, file_path=file_path)
             
-            # Update progress
-            if progress:
-                progress.setValue(70)
+            # Process the image
+            result = process_student_image(file_path, image_bytes=image_bytes)
+            thumbnail = self._load_photo_thumbnail(image_bytes)
+            del image_bytes  # Don't hold on to the raw file while the results are built
             
-            # Store the results for displaying after thread completes
-            self.ocr_results = {
+            results = {
                 'file_path': file_path,
                 'student_id': result.get('student_id', 'Not detected'),
                 'name': result.get('name', 'Not detected'),
@@ -762,179 +960,224 @@ class MainWindow(QMainWindow):
                 'face_detected': result.get('face_detected', False),
                 'face_count': result.get('face_count', 0),
                 'face_locations': result.get('face_locations', []),
-                'has_face_encoding': result.get('has_face_encoding', False),
-                'face_detection_error': result.get('face_detection_error', None)
+                'face_detection_error': result.get('face_detection_error', None),
+                'thumbnail': thumbnail
             }
             
+            with self._ocr_cache_lock:
+                self._ocr_cache[key] = results
+                while len(self._ocr_cache) > self.OCR_CACHE_SIZE:
+                    self._ocr_cache.popitem(last=False)
+            
+            return results
+            
         except Exception as e:
             logging.error(f"OCR processing error: {str(e)}")
-            self.ocr_results = {
+            return {
                 'file_path': file_path,
                 'error': str(e),
                 'success': False
             }
+
+    def _on_single_photo_done(self, results):
+        """Show the OCR results for a single student photo"""
+        if results['success']:
+            # Create dialog with results
+            dialog = QDialog(self)
+            dialog.setWindowTitle("Student Photo OCR Results")
+            dialog.resize(500, 500)
             
-        finally:
-            # Update progress to complete
-            if progress and progress.value() < 100:
-                progress.setValue(100)
-
-    def check_ocr_status(self, progress):
-        """Check if OCR processing is complete and show results"""
-        if not self.ocr_thread.is_alive():
-            # Stop the timer
-            self.ocr_timer.stop()
+            # Layout
+            layout = QVBoxLayout(dialog)
             
-            # Close progress dialog
-            progress.setValue(100)
+            # Results, built as one rich-text label instead of a widget per field
+            face_detected = results.get('face_detected', False)
+            face_count = results.get('face_count', 0)
             
-            # Show results
-            if hasattr(self, 'ocr_results'):
-                if self.ocr_results['success']:
-                    # Create dialog with results
-                    dialog = QDialog(self)
-                    dialog.setWindowTitle("Student Photo OCR Results")
-                    dialog.resize(500, 500)
-                    
-                    # Layout
-                    layout = QVBoxLayout(dialog)
-                    
-                    # Results
-                    layout.addWidget(QLabel("<h3>Extracted Student Information</h3>"))
-                    layout.addWidget(QLabel(f"<b>File:</b> {os.path.basename(self.ocr_results['file_path'])}"))
-                    layout.addWidget(QLabel(f"<b>Student ID:</b> {self.ocr_results['student_id']}"))
-                    layout.addWidget(QLabel(f"<b>Name:</b> {self.ocr_results['name']}"))
-                    layout.addWidget(QLabel(f"<b>Date of Birth:</b> {self.ocr_results['dob']}"))
-                    
-                    # Add a note about accuracy
-                    layout.addWidget(QLabel("<i>Note: OCR results may require verification</i>"))
-                    
-                    # Add face detection results if available
-                    layout.addWidget(QLabel("<h3>Face Detection Results</h3>"))
-                    
-                    # Create horizontal layout for image preview and face info
-                    h_layout = QHBoxLayout()
-                    
-                    # Add image preview
-                    try:
-                        pixmap = QPixmap(self.ocr_results['file_path'])
-                        if not pixmap.isNull():
-                            # Scale to a reasonable size
-                            pixmap = pixmap.scaled(200, 200, Qt.AspectRatioMode.KeepAspectRatio)
-                            image_label = QLabel()
-                            image_label.setPixmap(pixmap)
-                            image_label.setFixedSize(200, 200)
-                            image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                            image_label.setScaledContents(True)
-                            h_layout.addWidget(image_label)
-                    except Exception as e:
-                        logger.error(f"Error displaying image: {e}")
-                    
-                    # Add face detection information
-                    face_info = QVBoxLayout()
-                    face_detected = self.ocr_results.get('face_detected', False)
-                    face_count = self.ocr_results.get('face_count', 0)
-                    
-                    if face_detected:
-                        face_info.addWidget(QLabel(f"<b>Face Detected:</b> <span style='color:green'>Yes</span>"))
-                        face_info.addWidget(QLabel(f"<b>Number of Faces:</b> {face_count}"))
-                        
-                        # Add more details if available
-                        if 'face_locations' in self.ocr_results and self.ocr_results['face_locations']:
-                            locations_text = ", ".join([f"({t},{r},{b},{l})" for t, r, b, l in self.ocr_results['face_locations'][:3]])
-                            face_info.addWidget(QLabel(f"<b>Face Locations:</b> {locations_text}"))
-                            
-                        if 'has_face_encoding' in self.ocr_results:
-                            has_encoding = "Yes" if self.ocr_results['has_face_encoding'] else "No"
-                            face_info.addWidget(QLabel(f"<b>Face Encoding:</b> {has_encoding}"))
-                    else:
-                        face_info.addWidget(QLabel(f"<b>Face Detected:</b> <span style='color:red'>No</span>"))
-                        if 'face_detection_error' in self.ocr_results:
-                            face_info.addWidget(QLabel(f"<b>Error:</b> {self.ocr_results['face_detection_error']}"))
-                    
-                    h_layout.addLayout(face_info)
-                    layout.addLayout(h_layout)
-                    
-                    # Add spacer
-                    layout.addItem(QSpacerItem(20, 20, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
-                    
-                    # Add buttons
-                    button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok)
-                    button_box.accepted.connect(dialog.accept)
-                    layout.addWidget(button_box)
-                    
-                    # Show dialog
-                    dialog.exec()
-                else:
-                    QMessageBox.warning(
-                        self,
-                        "OCR Error",
-                        f"Failed to extract information from the photo:\n{self.ocr_results.get('error', 'Unknown error')}"
-                    )
-                    
-            QMessageBox.critical(self, "Error", f"Could not open the log file: {e}")
+            if face_detected:
+                face_parts = [self._FACE_FOUND_HTML.substitute(face_count=face_count)]
+                
+                # Add more details if available
+                locations = results.get('face_locations')
+                if locations:
+                    locations_text = ", ".join("({0},{1},{2},{3})".format(*t) for t in locations[:3])
+                    face_parts.append(f"<b>Face Locations:</b> {locations_text}")
+            else:
+                face_parts = [self._FACE_MISSING_HTML]
+                if 'face_detection_error' in results:
+                    face_parts.append(f"<b>Error:</b> {results['face_detection_error']}")
+            
+            html = self._OCR_RESULT_HTML.substitute(
+                file=os.path.basename(results['file_path']),
+                student_id=results['student_id'],
+                name=results['name'],
+                dob=results['dob'],
+                face_info="<br>".join(face_parts)
+            )
+            layout.addWidget(QLabel(html))
+            
+            # Add image preview; kept as its own label since it holds a pixmap
+            try:
+                # The thumbnail was already scaled down on the worker thread
+                thumbnail = results.get('thumbnail')
+                if thumbnail is not None and not thumbnail.isNull():
+                    image_label = QLabel()
+                    image_label.setPixmap(QPixmap.fromImage(thumbnail))
+                    image_label.setFixedSize(self.PHOTO_THUMBNAIL_SIZE, self.PHOTO_THUMBNAIL_SIZE)
+                    image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+                    layout.addWidget(image_label)
+            except Exception as e:
+                logger.error(f"Error displaying image: {e}")
+            
+            # Add spacer
+            layout.addItem(QSpacerItem(20, 20, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
+            
+            # Add buttons
+            button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok)
+            button_box.accepted.connect(dialog.accept)
+            layout.addWidget(button_box)
+            
+            # Show dialog
+            dialog.exec()
+        else:
+            QMessageBox.warning(
+                self,
+                "OCR Error",
+                f"Failed to extract information from the photo:\n{results.get('error', 'Unknown error')}"
+            )
 
     def _update_analytics(self, df):
-        """Render basic analytics charts in the Analytics tab."""
-        try:
-            # Clear the figure and create new subplots
-            fig = self.analytics_canvas.figure
-            fig.clear()
+        """Show analytics charts for df, rendering them on the thread pool if not cached."""
+        key = (tuple(df.columns), len(df))
+        self._analytics_key = key
+        
+        png = self._analytics_cache.get(key)
+        if png is not None:
+            self._analytics_cache.move_to_end(key)
+            self._show_analytics_png(png)
+            return
+        
+        self.analytics_label.setText("Rendering analytics...")
+        worker = Worker(self._analytics_task, df)
+        worker.signals.result.connect(lambda png, key=key: self._on_analytics_rendered(key, png))
+        worker.signals.error.connect(lambda error: logger.error(f"Analytics rendering error: {error[1]}"))
+        self.threadpool.start(worker)
+    
+    def _on_analytics_rendered(self, key, png):
+        """Cache a rendered analytics image and show it if it is still current."""
+        self._analytics_cache[key] = png
+        while len(self._analytics_cache) > self.ANALYTICS_CACHE_SIZE:
+            self._analytics_cache.popitem(last=False)
+        
+        if key == self._analytics_key:
+            self._show_analytics_png(png)
+    
+    def _show_analytics_png(self, png):
+        """Display rendered analytics PNG bytes in the Analytics tab."""
+        pixmap = QPixmap()
+        pixmap.loadFromData(png, "PNG")
+        self.analytics_label.setPixmap(pixmap)
+    
+    def _analytics_task(self, df, progress_callback=None):
+        """Render analytics for df on the thread pool, charting a category column chosen from df itself."""
+        return self._render_analytics_png(df, PandasTableModel.plot_candidate(df))
+    
+    @classmethod
+    def _get_analytics_axes(cls):
+        """Return the shared analytics figure and its 2x2 axes, creating them on first use."""
+        if cls._analytics_fig is None:
+            # Matplotlib is imported on first use to keep it out of application startup
+            import matplotlib
+            matplotlib.use('Agg')  # pandas plotting goes through pyplot; keep it off-screen
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
             
-            # Create 2x2 grid of plots for better analytics
-            axs = fig.subplots(2, 2)
+            fig = Figure(figsize=(6, 4))
+            FigureCanvasAgg(fig)
+            cls._analytics_axs = fig.subplots(2, 2)
+            cls._analytics_fig = fig
+            return fig, cls._analytics_axs, True
+        
+        return cls._analytics_fig, cls._analytics_axs, False
+    
+    @classmethod
+    def _render_analytics_png(cls, df, plot_column=None, progress_callback=None):
+        """Render basic analytics charts for df to PNG bytes (safe to run off the GUI thread).
+        
+        plot_column is the categorical column charted in the last plot, if any.
+        """
+        # Renders share one figure, so only one worker may draw at a time
+        with cls._analytics_fig_lock:
+            fig, axs, first_render = cls._get_analytics_axes()
+            for ax in axs.flat:
+                ax.cla()
             
-            # Plot 1: Column counts (non-null values)
-            ax1 = axs[0, 0]
-            df.count().plot(kind='bar', color='#3182ce', ax=ax1)
-            ax1.set_title('Non-null values per column')
-            ax1.set_ylabel('Count')
-            ax1.tick_params(axis='x', labelrotation=45, labelsize=8)
+            cls._draw_analytics(df, axs, plot_column, cls.ANALYTICS_SAMPLE_ROWS)
             
-            # Plot 2: Data types
-            ax2 = axs[0, 1]
-            dtypes = df.dtypes.value_counts().reset_index()
-            dtypes.columns = ['Data Type', 'Count']
-            dtypes.plot(kind='pie', y='Count', labels=dtypes['Data Type'], ax=ax2, autopct='%1.1f%%')
-            ax2.set_title('Data Types Distribution')
-            ax2.set_ylabel('')
+            # Lay the grid out once; later renders keep the same axes positions
+            if first_render:
+                fig.tight_layout()
+            buf = io.BytesIO()
+            fig.savefig(buf, format='png')
+            return buf.getvalue()
+    
+    @staticmethod
+    def _draw_analytics(df, axs, plot_column=None, sample_rows=None):
+        """Draw the analytics charts for df onto the 2x2 axes grid."""
+        # One counting pass serves both the non-null and the missing value charts;
+        # it only keeps a count per column, unlike materialising df.isna()
+        counts = df.count()
+        
+        # Plot 1: Column counts (non-null values)
+        ax1 = axs[0, 0]
+        counts.plot(kind='bar', color='#3182ce', ax=ax1)
+        ax1.set_title('Non-null values per column')
+        ax1.set_ylabel('Count')
+        ax1.tick_params(axis='x', labelrotation=45, labelsize=8)
+        
+        # Plot 2: Data types
+        ax2 = axs[0, 1]
+        dtypes = df.dtypes.value_counts().reset_index()
+        dtypes.columns = ['Data Type', 'Count']
+        dtypes.plot(kind='pie', y='Count', labels=dtypes['Data Type'], ax=ax2, autopct='%1.1f%%')
+        ax2.set_title('Data Types Distribution')
+        ax2.set_ylabel('')
+        
+        # Plot 3: Missing values
+        ax3 = axs[1, 0]
+        missing = ((len(df) - counts) / len(df) * 100).sort_values(ascending=False)
+        missing = missing[missing > 0]
+        if not missing.empty:
+            missing.plot(kind='bar', color='#e53e3e', ax=ax3)
+            ax3.set_title('Missing Values (%)')
+            ax3.set_ylabel('Percent Missing')
+            ax3.tick_params(axis='x', labelrotation=45, labelsize=8)
+        else:
+            ax3.text(0.5, 0.5, 'No Missing Values!', ha='center', va='center', fontsize=12)
+            ax3.set_title('Missing Values Analysis')
             
-            # Plot 3: Missing values
-            ax3 = axs[1, 0]
-            missing = (df.isnull().sum() / len(df) * 100).sort_values(ascending=False)
-            missing = missing[missing > 0]
-            if not missing.empty:
-                missing.plot(kind='bar', color='#e53e3e', ax=ax3)
-                ax3.set_title('Missing Values (%)')
-                ax3.set_ylabel('Percent Missing')
-                ax3.tick_params(axis='x', labelrotation=45, labelsize=8)
-            else:
-                ax3.text(0.5, 0.5, 'No Missing Values!', ha='center', va='center', fontsize=12)
-                ax3.set_title('Missing Values Analysis')
-                
-            # Plot 4: Row counts by a category (if categorical column exists)
-            ax4 = axs[1, 1]
-            categorical_cols = df.select_dtypes(include=['object', 'category']).columns
-            if len(categorical_cols) > 0:
-                # Pick first categorical column with manageable unique values
-                for col in categorical_cols:
-                    if df[col].nunique() <= 10:
-                        df[col].value_counts().plot(kind='barh', ax=ax4, color='#805ad5')
-                        ax4.set_title(f'Counts by {col}')
-                        break
+        # Plot 4: Row counts by a category (if categorical column exists)
+        ax4 = axs[1, 1]
+        categorical_cols = df.select_dtypes(include=['object', 'category']).columns
+        if len(categorical_cols) > 0:
+            # The column with manageable unique values is chosen once per data set by the model
+            if plot_column is not None and plot_column in categorical_cols:
+                values = df[plot_column]
+                if sample_rows and len(values) > sample_rows:
+                    # A fixed-seed sample has the same bar shape; scale back to full-size counts
+                    scale = len(values) / sample_rows
+                    category_counts = (values.sample(sample_rows, random_state=0).value_counts() * scale).round()
                 else:
-                    ax4.text(0.5, 0.5, 'No suitable categorical column\nfor visualization', 
-                             ha='center', va='center', fontsize=10)
-                    ax4.set_title('Category Analysis')
+                    category_counts = values.value_counts()
+                category_counts.plot(kind='barh', ax=ax4, color='#805ad5')
+                ax4.set_title(f'Counts by {plot_column}')
             else:
-                ax4.text(0.5, 0.5, 'No categorical columns found', ha='center', va='center', fontsize=10)
+                ax4.text(0.5, 0.5, 'No suitable categorical column\nfor visualization', 
+                         ha='center', va='center', fontsize=10)
                 ax4.set_title('Category Analysis')
-                
-            # Apply tight layout to figure (not canvas)
-            fig.tight_layout()
-            self.analytics_canvas.draw()
-        except Exception as e:
-            logger.error(f"Analytics rendering error: {e}")
+        else:
+            ax4.text(0.5, 0.5, 'No categorical columns found', ha='center', va='center', fontsize=10)
+            ax4.set_title('Category Analysis')
 
     def _update_status(self, percent, message):
         """Slot to safely update the progress bar and status message."""
@@ -954,7 +1197,18 @@ class MainWindow(QMainWindow):
     apply_field_mapping = apply_field_mapping
     
     def on_search_changed(self, text):
-        """Handle search text changes and filter the data preview."""
+        """Handle search text changes by (re)starting the debounce timer."""
+        if not text:
+            # Clearing the box restores the full view straight away
+            self._search_timer.stop()
+            self._do_search()
+            return
+        
+        self._search_timer.start()
+    
+    def _do_search(self):
+        """Filter the data preview with the current search text."""
+        text = self.search_input.text()
         try:
             # Apply search filter to the model
             self.preview_model.search(text)
@@ -973,22 +1227,51 @@ class MainWindow(QMainWindow):
             logger.error(f"Search error: {str(e)}")
             self.status_bar.showMessage(f"Search error: {str(e)}", 3000)
             
+    def _start_detached(self, program, arguments):
+        """Launch an external program without blocking the GUI thread on it."""
+        try:
+            from PyQt6.QtCore import QProcess
+        except ImportError:
+            import subprocess
+            subprocess.Popen([program, *arguments])
+            return
+        
+        if not QProcess.startDetached(program, arguments)[0]:
+            raise OSError(f"Could not start {program}")
+
+    def _warm_settings(self):
+        """Create and build the settings dialog ahead of its first use"""
+        if self._settings_dialog is None:
+            from app.views.settings_dialog import SettingsDialog
+            self._settings_dialog = SettingsDialog(self)
+            self._settings_dialog.prepare()
+        return self._settings_dialog
+
+    def open_settings(self):
+        """Show the settings dialog"""
+        self._warm_settings().exec()
+
     def show_logs(self):
         """Find and open the most recent log file."""
         logs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "logs")
         if os.path.exists(logs_dir):
-            log_files = [os.path.join(logs_dir, f) for f in os.listdir(logs_dir) 
-                      if f.startswith("app_") and f.endswith(".log")]
-            if log_files:
-                latest_log = max(log_files, key=os.path.getctime)
+            # scandir entries cache their stat results, so picking the newest is a single pass
+            with os.scandir(logs_dir) as entries:
+                latest_entry = max(
+                    (e for e in entries if e.name.startswith("app_") and e.name.endswith(".log")),
+                    key=lambda e: e.stat().st_ctime,
+                    default=None
+                )
+            if latest_entry is not None:
+                latest_log = latest_entry.path
                 
                 try:
+                    import platform
                     if platform.system() == "Windows":
-                        os.startfile(latest_log)
-                    elif platform.system() == "Darwin":  # macOS
-                        subprocess.run(["open", latest_log], check=True)
-                    else:  # Linux
-                        subprocess.run(["xdg-open", latest_log], check=True)
+                        os.startfile(latest_log)  # Already returns without waiting
+                    else:
+                        opener = "open" if platform.system() == "Darwin" else "xdg-open"  # macOS / Linux
+                        self._start_detached(opener, [latest_log])
                 except Exception as e:
                     logger.error(f"Failed to open log file: {e}")
                     QMessageBox.critical(self, "Error", f"Could not open the log file: {e}")
@@ -5,6 +5,8 @@ Simplified Main window implementation for Education Data Cleaning Tool.
 import os
 import sys
 import logging
+from pathlib import Path
+import pandas as pd
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QLabel, QFileDialog, QTableView, 
@@ -12,7 +14,7 @@ from PyQt6.QtWidgets import (
     QCheckBox, QSpinBox, QGroupBox, QFormLayout,
     QFrame, QStatusBar, QLineEdit
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QSize
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QTimer
 from PyQt6.QtGui import QAction
 
 from app.controllers.data_cleaner import DataCleaner
@@ -22,6 +24,13 @@ from app.models.data_model import PandasTableModel, CleaningOptions
 class MainWindow(QMainWindow):
     """Main application window for the Education Data Cleaning Tool"""
     
+    # Column name keywords used to pre-select each column combo, as regex alternations
+    AUTO_SELECT_PATTERNS = {
+        'name': 'name|student|person',
+        'dob': 'birth|dob|date',
+        'year': 'year|academic|session',
+    }
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Education Data Cleaning Tool")
@@ -191,27 +200,19 @@ class MainWindow(QMainWindow):
     
     def _auto_select_columns(self, columns):
         """Try to auto-select appropriate columns based on names"""
-        # For name column
-        for i, col in enumerate(columns):
-            col_lower = col.lower()
-            if any(keyword in col_lower for keyword in ["name", "student", "person"]):
-                self.name_combo.setCurrentIndex(i)
-                break
-        
-        # For date of birth
-        for i, col in enumerate(columns):
-            col_lower = col.lower()
-            if any(keyword in col_lower for keyword in ["birth", "dob", "date"]):
-                self.dob_combo.setCurrentIndex(i)
-                break
-        
-        # For academic year
-        for i, col in enumerate(columns):
-            col_lower = col.lower()
-            if any(keyword in col_lower for keyword in ["year", "academic", "session"]):
-                self.year_combo.setCurrentIndex(i)
-                break
+        cols_lower = pd.Series(columns, dtype=object).astype(str).str.lower()
+        combos = {'name': self.name_combo, 'dob': self.dob_combo, 'year': self.year_combo}
+        
+        # One regex pass over all column names per combo; select the first match
+        for field, pattern in self.AUTO_SELECT_PATTERNS.items():
+            mask = cols_lower.str.contains(pattern, regex=True, na=False).to_numpy()
+            if mask.any():
+                combos[field].setCurrentIndex(int(mask.argmax()))
                 
+    def _show_error(self, title, message):
+        """Show an error dialog once control returns to the event loop"""
+        QTimer.singleShot(0, lambda: QMessageBox.critical(self, title, message))
+        
     def process_data(self):
         """Process the data to find duplicates"""
         # Update options from UI
@@ -223,6 +224,7 @@ class MainWindow(QMainWindow):
         
         # Validate selections
         if not all([self.options.name_column, self.options.dob_column, self.options.year_column]):
+            self.status_bar.showMessage("Please select columns for name, date of birth, and academic year.")
             QMessageBox.warning(self, "Missing Selection", 
                                 "Please select columns for name, date of birth, and academic year.")
             return
@@ -244,31 +246,29 @@ class MainWindow(QMainWindow):
             
             if result:
                 self.progress_bar.setValue(100)
-                self.status_bar.showMessage(f"Found {result['duplicate_records']} duplicates")
                 
                 # Enable export
                 self.export_btn.setEnabled(True)
                 self.export_action.setEnabled(True)
                 
-                # Show a summary
+                # Show a summary in the status bar rather than a modal dialog
                 summary = (
-                    f"Total records: {result['total_records']}\n"
+                    f"Total records: {result['total_records']} | "
                     f"Clean records: {result['clean_records']} "
-                    f"({result['clean_records']/result['total_records']*100:.1f}%)\n"
+                    f"({result['clean_records']/result['total_records']*100:.1f}%) | "
                     f"Duplicate records: {result['duplicate_records']} "
-                    f"({result['duplicate_records']/result['total_records']*100:.1f}%)\n"
+                    f"({result['duplicate_records']/result['total_records']*100:.1f}%)"
                 )
-                
-                QMessageBox.information(self, "Processing Complete", summary)
+                self.status_bar.showMessage(summary, 10000)
             else:
                 self.progress_bar.setValue(0)
                 self.status_bar.showMessage("Processing failed")
-                QMessageBox.critical(self, "Error", "Failed to process data.")
+                self._show_error("Error", "Failed to process data.")
                 
         except Exception as e:
             self.progress_bar.setValue(0)
             self.status_bar.showMessage(f"Error: {str(e)}")
-            QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
+            self._show_error("Error", f"An error occurred: {str(e)}")
             
     def export_data(self):
         """Export the clean and duplicate data to CSV files"""
@@ -276,31 +276,30 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "No Data", "No processed data to export.")
             return
             
-        # Get base output path
-        output_dir = os.path.dirname(self.options.input_file)
-        base_name = os.path.splitext(os.path.basename(self.options.input_file))[0]
+        # Default output sits next to the input file
+        input_path = Path(self.options.input_file)
+        default_clean = input_path.with_name(f"{input_path.stem}_clean.csv")
         
         clean_path, _ = QFileDialog.getSaveFileName(
             self, "Save Clean Data", 
-            os.path.join(output_dir, f"{base_name}_clean.csv"),
+            str(default_clean),
             "CSV Files (*.csv)"
         )
         
         if not clean_path:
             return
             
-        # Generate duplicate path based on clean path
-        duplicate_path = clean_path.replace("_clean.csv", "_duplicates.csv")
-        if clean_path == duplicate_path:
-            duplicate_path = os.path.splitext(clean_path)[0] + "_duplicates.csv"
+        # Duplicates go in a sibling file named after the clean file's stem
+        clean_path = Path(clean_path)
+        duplicate_path = clean_path.with_name(clean_path.stem.removesuffix('_clean') + '_duplicates.csv')
         
         self.status_bar.showMessage("Exporting data...")
         
         try:
-            result = self.data_cleaner.export_data(clean_path, duplicate_path)
+            result = self.data_cleaner.export_data(str(clean_path), str(duplicate_path))
             
             if result:
-                self.status_bar.showMessage(f"Data exported successfully: {os.path.basename(clean_path)}")
+                self.status_bar.showMessage(f"Data exported successfully: {clean_path.name}")
                 QMessageBox.information(
                     self, "Export Complete",
                     f"Clean data ({result['clean_records']} records) exported to:\n{clean_path}\n\n"
@@ -1,14 +1,33 @@
 """
 Quantize AI interface for the Education Data Cleaning Tool
 """
-import pandas as pd
 import logging
+from itertools import chain
 
+import pandas as pd
 from PyQt6.QtWidgets import QMessageBox
-from app.views.field_mapper_dialog import FieldMapperDialog
 
 logger = logging.getLogger(__name__)
 
+# Non-null values per column sent to the mapper; enough to recognise a column's contents
+COLUMN_SAMPLE_SIZE = 200
+
+
+def build_column_samples(df):
+    """
+    Build a small frame holding the first non-null values (as strings) of each column
+    
+    Args:
+        df: Full DataFrame being mapped
+        
+    Returns:
+        DataFrame with the same columns and at most COLUMN_SAMPLE_SIZE rows
+    """
+    return pd.DataFrame({
+        col: pd.Series(df[col].dropna().astype(str).head(COLUMN_SAMPLE_SIZE).tolist(), dtype=object)
+        for col in df.columns
+    })
+
 def run_field_mapping(self):
     """
     Launch the Quantize AI field mapping dialog
@@ -19,8 +38,15 @@ def run_field_mapping(self):
             QMessageBox.warning(self, "No Data", "Please load data first.")
             return
         
-        # Create and show the field mapper dialog
-        mapper_dialog = FieldMapperDialog(self.data, self)
+        # Imported on first use so the dialog stays out of application startup
+        from app.views.field_mapper_dialog import FieldMapperDialog
+        
+        # The mapper only needs column samples; build them once per loaded frame
+        if getattr(self, '_column_samples', None) is None:
+            self._column_samples = build_column_samples(self.data)
+        
+        # Create and show the field mapper dialog; the samples aren't whole records, so preview real rows
+        mapper_dialog = FieldMapperDialog(self._column_samples, self, preview=self.data.head(5))
         mapper_dialog.mapping_confirmed.connect(self.apply_field_mapping)
         mapper_dialog.exec()
         
@@ -41,22 +67,26 @@ def apply_field_mapping(self, field_mapping):
         if not field_mapping:
             return
             
-        # Create a copy of the DataFrame with mapped columns
-        mapped_data = pd.DataFrame()
-        
-        for orig_col, std_field in field_mapping.items():
-            mapped_data[std_field] = self.data[orig_col]
-        
-        # Add any unmapped columns as-is
-        for col in self.data.columns:
-            if col not in field_mapping and col not in mapped_data:
-                mapped_data[col] = self.data[col]
+        mapped_src = set(field_mapping)
+        mapped_dst = set(field_mapping.values())
+        unmapped = [col for col in self.data.columns if col not in mapped_src]
         
-        # Replace the original data with the mapped data
-        self.data = mapped_data
+        if len(mapped_dst) == len(field_mapping) and mapped_dst.isdisjoint(unmapped):
+            # Rename mapped columns in place of copying them; unmapped columns are kept as-is
+            self.data = self.data.rename(columns=field_mapping)
+            columns_renamed = True
+        else:
+            # Several columns map to one field, or a field name is already taken by an
+            # unmapped column; rename would produce duplicate labels, so rebuild instead
+            self.data = pd.DataFrame(dict(chain(
+                ((std_field, self.data[orig_col]) for orig_col, std_field in field_mapping.items()),
+                ((col, self.data[col]) for col in unmapped if col not in mapped_dst)
+            )))
+            columns_renamed = False
+        self._column_samples = None
         
-        # Update the model
-        self.preview_model.setDataFrame(self.data)
+        # After a plain rename the model keeps its cached cells and only refreshes the header
+        self.preview_model.setDataFrame(self.data, columns_renamed=columns_renamed)
         
         # Update column selectors
         self._update_column_selectors()
@@ -65,7 +95,7 @@ def apply_field_mapping(self, field_mapping):
         self._auto_select_columns(self.data.columns)
         
         # Enable processing
-        self.process_btn.setEnabled(True)
+        self.process_data_btn.setEnabled(True)
         
         # Show success message
         self.status_bar.showMessage(f"Successfully mapped {len(field_mapping)} fields.")
@@ -3,16 +3,11 @@ Settings dialog for the Education Data Cleaning Tool.
 """
 
 import os
-from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
-    QLabel, QLineEdit, QCheckBox, QSpinBox, QTabWidget,
-    QPushButton, QGroupBox, QMessageBox, QComboBox,
-    QFileDialog, QDialogButtonBox
-)
+# Only the base class is needed at import time; widgets are imported where they are built
+from PyQt6.QtWidgets import QDialog
 from PyQt6.QtCore import Qt, pyqtSignal
 
-from app.utils.config import Config
-from app.utils.api_connector import ApiConfig, ApiConnector, MockEducationDataApi
+from app.utils.config import get_config
 
 
 class SettingsDialog(QDialog):
@@ -28,14 +23,41 @@ class SettingsDialog(QDialog):
         self.setMinimumWidth(500)
         
         # Load configuration
-        self.config = Config()
+        self.config = get_config()
         
-        # Setup UI
+        # Widgets are built when the dialog is first shown
+        self._initialized = False
+        self._dir_dialog = None  # Export directory picker, created on first browse
+        
+    def _initialize(self):
+        """Build the UI and load the settings into it, once"""
+        if self._initialized:
+            return
+        self._initialized = True
         self.setup_ui()
         self.load_settings()
         
+    def prepare(self):
+        """Build the dialog ahead of its first show, e.g. while the application is idle"""
+        self._initialize()
+        
+    def showEvent(self, event):
+        """Build the dialog on first show; later shows reload the saved settings"""
+        if self._initialized:
+            # A reused dialog may still hold edits from a cancelled show
+            self.load_settings()
+        else:
+            self._initialize()
+        super().showEvent(event)
+        
     def setup_ui(self):
         """Set up the dialog UI"""
+        from PyQt6.QtWidgets import (
+            QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
+            QLabel, QLineEdit, QCheckBox, QSpinBox, QTabWidget,
+            QPushButton, QGroupBox, QDialogButtonBox
+        )
+        
         main_layout = QVBoxLayout(self)
         
         # Create tabs
@@ -45,6 +67,7 @@ class SettingsDialog(QDialog):
         # General tab
         general_tab = QWidget()
         general_layout = QFormLayout(general_tab)
+        general_layout.setRowWrapPolicy(QFormLayout.RowWrapPolicy.DontWrapRows)
         
         # Export directory
         self.export_dir_edit = QLineEdit()
@@ -85,6 +108,7 @@ class SettingsDialog(QDialog):
         # API settings group
         api_group = QGroupBox("API Configuration (Future Use)")
         api_form = QFormLayout(api_group)
+        api_form.setRowWrapPolicy(QFormLayout.RowWrapPolicy.DontWrapRows)
         
         # API URL
         self.api_url_edit = QLineEdit()
@@ -126,6 +150,7 @@ class SettingsDialog(QDialog):
         # Usage Tracking
         usage_group = QGroupBox("Usage Tracking")
         usage_layout = QFormLayout(usage_group)
+        usage_layout.setRowWrapPolicy(QFormLayout.RowWrapPolicy.DontWrapRows)
         
         # Allow usage tracking
         self.usage_tracking_check = QCheckBox("Allow anonymous usage tracking to improve the tool")
@@ -152,12 +177,25 @@ class SettingsDialog(QDialog):
         
     def browse_export_dir(self):
         """Open a directory dialog to select the export directory"""
-        dir_path = QFileDialog.getExistingDirectory(
-            self, "Select Export Directory", self.export_dir_edit.text()
-        )
-        
-        if dir_path:
-            self.export_dir_edit.setText(dir_path)
+        from PyQt6.QtWidgets import QFileDialog
+        
+        # One dialog is kept for the life of the settings dialog so its directory
+        # model stays warm; custom icons and symlink resolution cost a stat per entry
+        if self._dir_dialog is None:
+            dialog = QFileDialog(self, "Select Export Directory")
+            dialog.setFileMode(QFileDialog.FileMode.Directory)
+            dialog.setOption(QFileDialog.Option.ShowDirsOnly, True)
+            dialog.setOption(QFileDialog.Option.DontUseCustomDirectoryIcons, True)
+            dialog.setOption(QFileDialog.Option.DontResolveSymlinks, True)
+            self._dir_dialog = dialog
+        
+        if self.export_dir_edit.text():
+            self._dir_dialog.setDirectory(self.export_dir_edit.text())
+        
+        if self._dir_dialog.exec():
+            selected = self._dir_dialog.selectedFiles()
+            if selected:
+                self.export_dir_edit.setText(selected[0])
     
     def toggle_api_fields(self, enabled):
         """Enable or disable API fields based on checkbox state"""
@@ -190,21 +228,26 @@ class SettingsDialog(QDialog):
     
     def save_settings(self):
         """Save settings to config"""
-        # Save general settings
-        self.config.set("export_directory", self.export_dir_edit.text())
-        self.config.set("auto_export", self.auto_export_check.isChecked())
-        self.config.set("chunk_size", self.chunk_size_spin.value())
-        
-        # Save API settings
-        self.config.set("enable_api", self.enable_api_check.isChecked())
-        self.config.set("api_url", self.api_url_edit.text())
-        self.config.set("api_key", self.api_key_edit.text())
-        self.config.set("api_timeout", self.api_timeout_spin.value())
-        self.config.set("api_retries", self.api_retries_spin.value())
-        
-        # Save usage settings
-        self.config.set("usage_tracking", self.usage_tracking_check.isChecked())
-        self.config.set("collect_feedback", self.feedback_check.isChecked())
+        new_settings = {
+            # General settings
+            "export_directory": self.export_dir_edit.text(),
+            "auto_export": self.auto_export_check.isChecked(),
+            "chunk_size": self.chunk_size_spin.value(),
+            # API settings
+            "enable_api": self.enable_api_check.isChecked(),
+            "api_url": self.api_url_edit.text(),
+            "api_key": self.api_key_edit.text(),
+            "api_timeout": self.api_timeout_spin.value(),
+            "api_retries": self.api_retries_spin.value(),
+            # Usage settings
+            "usage_tracking": self.usage_tracking_check.isChecked(),
+            "collect_feedback": self.feedback_check.isChecked(),
+        }
+        
+        # One batch update; save() only writes if a value actually changed, so OK
+        # without edits leaves the file untouched
+        self.config.update(new_settings)
+        self.config.save()
         
         # Emit signal
         self.settings_saved.emit()
@@ -214,6 +257,8 @@ class SettingsDialog(QDialog):
     
     def test_api_connection(self):
         """Test the API connection with current settings"""
+        from PyQt6.QtWidgets import QMessageBox
+        
         # Inform the user about the future capability
         QMessageBox.information(
             self,
@@ -222,45 +267,9 @@ class SettingsDialog(QDialog):
             "This application is currently designed to work as a native offline tool. \n\n"
             "API endpoints are being prepared and will be available in a future release."
         )
-        return
-        
-        # The following code is preserved for future API implementation
-        '''
-        if not self.enable_api_check.isChecked():
-            QMessageBox.warning(self, "API Disabled", "Please enable API integration first.")
-            return
-        
-        url = self.api_url_edit.text().strip()
-        if not url:
-            QMessageBox.warning(self, "Missing URL", "Please enter a valid API URL.")
-            return
-        
-        # Create API config
-        api_config = ApiConfig(
-            base_url=url,
-            api_key=self.api_key_edit.text().strip(),
-            timeout=self.api_timeout_spin.value(),
-            retry_count=self.api_retries_spin.value()
-        )
         
-        try:
-            # Create connector and test connection
-            connector = ApiConnector(api_config)
-            
-            # Show a waiting message while testing
-            QMessageBox.information(self, "Testing Connection", 
-                "Testing API connection. This might take a few seconds...")
-            
-            if connector.validate_connection():
-                QMessageBox.information(self, "Connection Successful", 
-                    "Successfully connected to the API.")
-            else:
-                QMessageBox.warning(self, "Connection Failed", 
-                    "Could not connect to the API. Please check your settings.")
-        except Exception as e:
-            QMessageBox.critical(self, "Connection Error", 
-                f"An error occurred while testing the API connection:\n{str(e)}")
-        '''
+        # When this is implemented, import ApiConfig/ApiConnector from
+        # app.utils.api_connector here rather than at module level
 
 
 class FeedbackDialog(QDialog):
@@ -272,11 +281,28 @@ class FeedbackDialog(QDialog):
         self.setWindowTitle("Feedback")
         self.setMinimumWidth(400)
         
-        # Setup UI
+        # Widgets are built when the dialog is first shown
+        self._initialized = False
+        
+    def _initialize(self):
+        """Build the UI, once"""
+        if self._initialized:
+            return
+        self._initialized = True
         self.setup_ui()
         
+    def showEvent(self, event):
+        """Build the dialog on first show"""
+        self._initialize()
+        super().showEvent(event)
+        
     def setup_ui(self):
         """Set up the dialog UI"""
+        from PyQt6.QtWidgets import (
+            QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+            QGroupBox, QComboBox, QDialogButtonBox
+        )
+        
         layout = QVBoxLayout(self)
         
         # Title
@@ -296,6 +322,7 @@ class FeedbackDialog(QDialog):
             "⭐⭐ Unsatisfied",
             "⭐ Very Unsatisfied"
         ])
+        self._ratings = (5, 4, 3, 2, 1)  # Rating for each combo entry, in order
         rating_layout.addWidget(self.rating_combo)
         
         layout.addWidget(rating_group)
@@ -316,8 +343,10 @@ class FeedbackDialog(QDialog):
         
     def get_rating(self):
         """Get the selected rating (5 to 1)"""
-        return 5 - self.rating_combo.currentIndex()
+        self._initialize()
+        return self._ratings[self.rating_combo.currentIndex()]
         
     def get_comments(self):
         """Get the comments text"""
+        self._initialize()
         return self.comment_edit.text()
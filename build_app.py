@@ -3,7 +3,7 @@
 
 """
 Build script for creating distributable packages of the Education Data Cleaning Tool.
-Creates standalone executables for Mac (.dmg) and Windows (.exe).
+Creates standalone applications for Mac (.dmg) and Windows (folder with .exe).
 """
 
 import os
@@ -29,8 +29,16 @@ def create_build_dirs():
             os.makedirs(directory)
             print(f"Created directory: {directory}")
 
-def build_windows():
-    """Build Windows executable (.exe)"""
+def list_resources():
+    """Return the file names in the resources directory, read with a single listing"""
+    return set(os.listdir("resources")) if os.path.isdir("resources") else set()
+
+def build_windows(resources):
+    """Build Windows executable (.exe)
+    
+    Args:
+        resources: File names present in the resources directory
+    """
     print("Building Windows executable...")
     
     # PyInstaller command for Windows
@@ -38,20 +46,29 @@ def build_windows():
         "pyinstaller",
         "--name", APP_NAME,
         "--windowed",  # GUI mode
-        "--onefile",   # Single file executable
-        f"--icon={ICON_PATH}" if os.path.exists(ICON_PATH) else "",
+        "--onedir",    # Directory mode; --onefile unpacks the whole bundle on every launch
+    ]
+    if os.path.basename(ICON_PATH) in resources:
+        cmd.append(f"--icon={ICON_PATH}")
+    cmd += [
         "--add-data", "resources;resources",
         "--clean",  # Clean PyInstaller cache
         MAIN_SCRIPT
     ]
     
-    # Run PyInstaller
-    subprocess.run([arg for arg in cmd if arg != ""])
+    # Run PyInstaller; a failed build stops here instead of reporting success
+    subprocess.run(cmd, check=True)
     
-    print(f"Windows executable created at: dist/{APP_NAME}.exe")
+    print(f"Windows executable created at: dist/{APP_NAME}/{APP_NAME}.exe")
+    print(f"Distribute the dist/{APP_NAME} folder (e.g. zipped or via an installer).")
 
-def build_mac():
-    """Build macOS application (.app and .dmg)"""
+def build_mac(resources):
+    """Build macOS application (.app and .dmg)
+    
+    Args:
+        resources: File names present in the resources directory
+    """
+    has_mac_icon = os.path.basename(MAC_ICON_PATH) in resources
     print("Building macOS application...")
     
     # PyInstaller command for macOS
@@ -60,14 +77,17 @@ def build_mac():
         "--name", APP_NAME,
         "--windowed",  # GUI mode
         "--onedir",    # Directory mode for Mac
-        f"--icon={MAC_ICON_PATH}" if os.path.exists(MAC_ICON_PATH) else "",
+    ]
+    if has_mac_icon:
+        cmd.append(f"--icon={MAC_ICON_PATH}")
+    cmd += [
         "--add-data", "resources:resources",
         "--clean",  # Clean PyInstaller cache
         MAIN_SCRIPT
     ]
     
-    # Run PyInstaller
-    subprocess.run([arg for arg in cmd if arg != ""])
+    # Run PyInstaller; a failed build stops here instead of reporting success
+    subprocess.run(cmd, check=True)
     
     # Create DMG using create-dmg if available
     try:
@@ -79,10 +99,10 @@ def build_mac():
             if subprocess.call(["which", "create-dmg"], stdout=devnull, stderr=devnull) == 0:
                 print("Creating DMG package...")
                 
-                dmg_cmd = [
-                    "create-dmg",
-                    "--volname", f"{APP_NAME} Installer",
-                    "--volicon", MAC_ICON_PATH if os.path.exists(MAC_ICON_PATH) else "",
+                dmg_cmd = ["create-dmg", "--volname", f"{APP_NAME} Installer"]
+                if has_mac_icon:
+                    dmg_cmd += ["--volicon", MAC_ICON_PATH]
+                dmg_cmd += [
                     "--window-pos", "200", "100",
                     "--window-size", "800", "400",
                     "--icon-size", "100",
@@ -93,7 +113,7 @@ def build_mac():
                     app_path
                 ]
                 
-                subprocess.run([arg for arg in dmg_cmd if arg != ""])
+                subprocess.run(dmg_cmd, check=True)
                 print(f"DMG package created at: {dmg_path}")
             else:
                 print("create-dmg not found. Install it with 'brew install create-dmg' to create DMG files.")
@@ -105,13 +125,14 @@ def build_mac():
 def main():
     """Main entry point for the build script"""
     create_build_dirs()
+    resources = list_resources()
     
     # Determine which build to run based on platform
     system = platform.system()
     if system == "Windows":
-        build_windows()
+        build_windows(resources)
     elif system == "Darwin":  # macOS
-        build_mac()
+        build_mac(resources)
     else:
         print(f"Building for {system} is not currently supported.")
         sys.exit(1)
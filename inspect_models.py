@@ -1,52 +1,119 @@
 #!/usr/bin/env python3
 """
 Inspect what's available in the face_recognition_models package
+
+By default the packages are only located and their source parsed, so dlib and
+the model files are not loaded. Pass --deep to import them and list their
+attributes at runtime.
 """
 
+import ast
 import sys
-import pprint
-
-print("Checking face_recognition_models...")
-try:
-    import face_recognition_models
-    print(f"Successfully imported face_recognition_models version: {face_recognition_models.__version__}")
-    
-    # Print all available attributes
-    print("\nAvailable attributes:")
-    attrs = dir(face_recognition_models)
-    pprint.pprint(attrs)
-    
-    # Try to call the available functions
-    print("\nTrying resource_filename:")
-    if 'resource_filename' in attrs:
-        print(face_recognition_models.resource_filename("face_recognition_models", "models/shape_predictor_68_face_landmarks.dat"))
-    
+import argparse
+import importlib
+import importlib.util
+
+
+def module_names(spec):
+    """Return the top-level names defined in a module's source, without importing it"""
+    if not spec.origin or not spec.origin.endswith(".py"):
+        return []
+    with open(spec.origin, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=spec.origin)
+
+    names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.Assign):
+            names.update(target.id for target in node.targets if isinstance(target, ast.Name))
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+    return sorted(names)
+
+
+def inspect_models_package(deep):
+    """Report on face_recognition_models"""
+    print("Checking face_recognition_models...")
+    spec = importlib.util.find_spec("face_recognition_models")
+    if spec is None:
+        print("face_recognition_models is missing")
+        return
+    print(f"face_recognition_models is available at: {spec.origin}")
+
+    if not deep:
+        attrs = module_names(spec)
+        print("\nNames defined in the package source:")
+        print(*attrs, sep="\n")
+    else:
+        face_recognition_models = importlib.import_module("face_recognition_models")
+        print(f"Successfully imported face_recognition_models version: {face_recognition_models.__version__}")
+
+        # Print all available attributes
+        print("\nAvailable attributes:")
+        attrs = dir(face_recognition_models)
+        print(*attrs, sep="\n")
+
+        # Try to call the available functions
+        print("\nTrying resource_filename:")
+        if 'resource_filename' in attrs:
+            print(face_recognition_models.resource_filename("face_recognition_models", "models/shape_predictor_68_face_landmarks.dat"))
+
     # Check if there are any model-related files/functions
     model_attrs = [attr for attr in attrs if 'model' in attr.lower()]
     print("\nModel-related attributes:")
-    pprint.pprint(model_attrs)
-    
-except ImportError as e:
-    print(f"Failed to import face_recognition_models: {e}")
-
-print("\nChecking face_recognition...")
-try:
-    import face_recognition
-    print(f"Successfully imported face_recognition")
-    
-    # Print the functions used for model locations
-    model_funcs = [func for func in dir(face_recognition) if 'model' in func.lower()]
-    print("\nModel-related functions in face_recognition:")
-    pprint.pprint(model_funcs)
-    
-    # Print face detection backend information
-    print("\nFace detection backend:")
-    # Check if this attribute exists
-    if hasattr(face_recognition, 'api'):
-        print(f"Has api module: {hasattr(face_recognition, 'api')}")
-        api_funcs = dir(face_recognition.api)
-        print("API functions:")
-        pprint.pprint([f for f in api_funcs if not f.startswith('_')])
-    
-except ImportError as e:
-    print(f"Failed to import face_recognition: {e}")
+    print(*model_attrs, sep="\n")
+
+
+def inspect_face_recognition(deep):
+    """Report on face_recognition; importing it loads dlib, so that only happens with --deep"""
+    print("\nChecking face_recognition...")
+    spec = importlib.util.find_spec("face_recognition")
+    if spec is None:
+        print("face_recognition is missing")
+        return
+    print(f"face_recognition is available at: {spec.origin}")
+
+    if not deep:
+        print("Run with --deep to import it and list its model-related functions.")
+        return
+
+    try:
+        face_recognition = importlib.import_module("face_recognition")
+        print(f"Successfully imported face_recognition")
+
+        # Print the functions used for model locations
+        model_funcs = [func for func in dir(face_recognition) if 'model' in func.lower()]
+        print("\nModel-related functions in face_recognition:")
+        print(*model_funcs, sep="\n")
+
+        # Print face detection backend information
+        print("\nFace detection backend:")
+        # Check if this attribute exists
+        if hasattr(face_recognition, 'api'):
+            print(f"Has api module: {hasattr(face_recognition, 'api')}")
+            api_funcs = dir(face_recognition.api)
+            print("API functions:")
+            print(*[f for f in api_funcs if not f.startswith('_')], sep="\n")
+
+    except ImportError as e:
+        print(f"Failed to import face_recognition: {e}")
+
+
+def main():
+    """Parse arguments and inspect the packages"""
+    parser = argparse.ArgumentParser(description="Inspect the face recognition packages")
+    parser.add_argument("--deep", action="store_true",
+                        help="Import the packages (loads dlib) and list their runtime attributes")
+    args = parser.parse_args()
+
+    try:
+        inspect_models_package(args.deep)
+    except ImportError as e:
+        print(f"Failed to import face_recognition_models: {e}")
+
+    inspect_face_recognition(args.deep)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,26 @@ Provides a convenient way to launch the application.
 
 import sys
 import os
-from app.main import main
+import multiprocessing
 
 if __name__ == "__main__":
-    # Add project root to path
+    # Photo batches use a spawn process pool; in a frozen build each worker re-runs
+    # this script, and freeze_support hands it off to the pool instead of the GUI
+    multiprocessing.freeze_support()
+    
+    # Add project root to path before anything from the app is imported
     sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
     
+    # Keep Qt's debug chatter out of startup unless asked for
+    os.environ.setdefault("QT_LOGGING_RULES", "*.debug=false")
+    
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtWidgets import QApplication
+    
+    # Native windows only where asked for; must be set before QApplication exists
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_DontCreateNativeWidgetSiblings)
+    
+    from app.main import main
+    
     # Run the application
     main()
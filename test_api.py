@@ -6,17 +6,15 @@ This script helps test and validate API connectivity.
 
 import os
 import sys
-import argparse
-import json
 
 # Add project root to path for imports
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from app.utils.api_tester import ApiTester
-
 
 def main():
     """Main entry point for the API test utility"""
+    import argparse
+    
     parser = argparse.ArgumentParser(description="Test API connectivity for Education Data Cleaning Tool")
     parser.add_argument("--url", help="API URL")
     parser.add_argument("--key", help="API Key")
@@ -27,6 +25,9 @@ def main():
     
     args = parser.parse_args()
     
+    # Imported after argument parsing so --help doesn't load the HTTP stack
+    from app.utils.api_tester import ApiTester
+    
     # Use mock URL if not specified and mock mode is enabled
     url = args.url
     if args.mock and not url: